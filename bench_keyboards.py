@@ -0,0 +1,44 @@
+import sys
+import timeit
+
+from keyboards.builders import get_interests_keyboard, _InterestsKeyboardCache
+from utils import bitset
+
+SIZES = [50, 500, 5000]
+SELECTED = 10
+
+
+def uncached_keyboard(interests: dict[int, str], selected: int, edit_mode: bool):
+    return _InterestsKeyboardCache(maxsize=0).get(interests, selected, edit_mode)
+
+
+def bench(label: str, func, number: int) -> None:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28} {seconds * 1e6:>10.1f} µs")
+
+
+def main() -> int:
+    for size in SIZES:
+        interests = {i: f"Интерес {i + 1}" for i in range(size)}
+        selected = bitset.from_ids(range(SELECTED))
+        number = max(10, 50000 // size)
+
+        print(f"{size} интересов:")
+        bench("без кэша", lambda: uncached_keyboard(interests, selected, False), number)
+
+        get_interests_keyboard(interests, selected)
+        bench("повтор (попадание в кэш)", lambda: get_interests_keyboard(interests, selected), number)
+
+        state = {"mask": selected, "i": 0}
+
+        def toggle():
+            state["i"] = (state["i"] + 1) % size
+            state["mask"] = bitset.toggle(state["mask"], state["i"])
+            get_interests_keyboard(interests, state["mask"])
+
+        bench("переключение (новый выбор)", toggle, number)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
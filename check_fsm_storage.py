@@ -0,0 +1,90 @@
+import asyncio
+import sys
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from aiogram.fsm.storage.base import StorageKey
+
+from states.states import CreateEvent
+from states.storage import RedisStorage
+
+TTL = 600
+KEY = StorageKey(bot_id=1, chat_id=100, user_id=100)
+
+
+async def create_redis(url: str | None):
+    if url:
+        from redis.asyncio import Redis
+        return Redis.from_url(url, decode_responses=True)
+
+    from fakeredis import FakeAsyncRedis
+    return FakeAsyncRedis(decode_responses=True)
+
+
+async def run_checks(storage: RedisStorage) -> list:
+    failures = []
+
+    def check(name: str, ok: bool, details=None):
+        if not ok:
+            failures.append(name)
+            print(f"❌ {name}: {details}")
+
+    state_key, data_key = storage._keys(KEY)
+    await storage.redis.delete(state_key, data_key)
+
+    await storage.set_state(KEY, CreateEvent.name)
+    state = await storage.get_state(KEY)
+    check("set_state", state == CreateEvent.name.state, state)
+
+    await storage.set_data(KEY, {"name": "Пикник", "picker_mask": 5, "interests": ["Бег", "Йога"]})
+    data = await storage.get_data(KEY)
+    check("set_data", data == {"name": "Пикник", "picker_mask": 5, "interests": ["Бег", "Йога"]}, data)
+
+    data = await storage.update_data(KEY, {"picker_mask": 7, "picker_page": 1})
+    expected = {"name": "Пикник", "picker_mask": 7, "interests": ["Бег", "Йога"], "picker_page": 1}
+    check("update_data", data == expected and await storage.get_data(KEY) == expected, data)
+
+    value = await storage.get_value(KEY, "picker_page")
+    missing = await storage.get_value(KEY, "missing", "default")
+    check("get_value", value == 1 and missing == "default", (value, missing))
+
+    await storage.redis.expire(state_key, 5)
+    await storage.redis.expire(data_key, 5)
+    await storage.update_data(KEY, {"picker_page": 2})
+    ttls = (await storage.redis.ttl(state_key), await storage.redis.ttl(data_key))
+    check("ttl refresh on update_data", all(ttl > TTL - 5 for ttl in ttls), ttls)
+
+    await storage.redis.expire(data_key, 5)
+    await storage.set_state(KEY, CreateEvent.date)
+    ttl = await storage.redis.ttl(data_key)
+    check("ttl refresh on set_state", ttl > TTL - 5, ttl)
+
+    await storage.redis.expire(state_key, 5)
+    await storage.set_data(KEY, {"name": "Кино"})
+    ttl = await storage.redis.ttl(state_key)
+    check("ttl refresh on set_data", ttl > TTL - 5, ttl)
+
+    await storage.set_state(KEY, None)
+    await storage.set_data(KEY, {})
+    state, data = await storage.get_state(KEY), await storage.get_data(KEY)
+    exists = await storage.redis.exists(state_key, data_key)
+    check("clear", state is None and data == {} and exists == 0, (state, data, exists))
+
+    return failures
+
+
+async def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else None
+    storage = RedisStorage(await create_redis(url), ttl=TTL)
+    try:
+        failures = await run_checks(storage)
+    finally:
+        await storage.close()
+
+    print(f"Хранилище: {url or 'fakeredis'}, проверок не пройдено: {len(failures)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import sys
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db_config import engine, Base
+from database.migrations import run_migrations
+from database.repositories import (
+    UserRepository, FriendRepository, EventRepository, ParticipantRepository
+)
+from database.repositories.interest import LINK_USER_INTERESTS_SQL, LINK_EVENT_INTERESTS_SQL
+
+SEED_USERS = 20000
+SEED_EVENTS = 20000
+
+WATCHED_TABLES = {
+    "users", "events", "event_participants", "event_invites",
+    "friends", "friend_requests", "user_interests", "event_interests",
+}
+
+SEED_SQL = [
+    "INSERT INTO interests (name) "
+    "SELECT 'plan_interest_' || g FROM generate_series(1, 50) g "
+    "ON CONFLICT DO NOTHING",
+
+    "INSERT INTO users (number, role, registered, tg_id, name, surname, gender, age, region, interests, created_at) "
+    "SELECT '+0' || lpad(g::text, 10, '0'), 'user', 1, 9000000000 + g, 'User' || g, 'Plan', "
+    "CASE WHEN g % 2 = 0 THEN 'Муж' ELSE 'Жен' END, 15 + g % 80, 'Region ' || (g % 40), "
+    "'plan_interest_' || (g % 50 + 1) || ',plan_interest_' || ((g * 7) % 50 + 1), now() "
+    "FROM generate_series(1, :users) g "
+    "ON CONFLICT DO NOTHING",
+
+    "INSERT INTO friends (user_id, friend_id, created_at) "
+    "SELECT 9000000000 + g, 9000000000 + (g + k) % :users + 1, now() "
+    "FROM generate_series(1, :users) g, generate_series(1, 5) k "
+    "ON CONFLICT DO NOTHING",
+
+    "INSERT INTO friend_requests (from_user_id, to_user_id, created_at) "
+    "SELECT 9000000000 + g, 9000000000 + (g + 17) % :users + 1, now() "
+    "FROM generate_series(1, :users) g "
+    "ON CONFLICT DO NOTHING",
+
+    "INSERT INTO events (organizer_phone, name, date, time, starts_at, interests, created_at) "
+    "SELECT '+0' || lpad((g % :users + 1)::text, 10, '0'), 'Plan event ' || g, '01.01.2030', '12:00', "
+    "now() + (g % 365 - 180) * interval '1 day', 'plan_interest_' || (g % 50 + 1), now() "
+    "FROM generate_series(1, :events) g",
+
+    "INSERT INTO events (organizer_phone, name, date, time, starts_at, created_at) "
+    "SELECT '+00000000003', 'Probe friend event ' || g, '01.01.2030', '12:00', now() + g * interval '1 hour', now() "
+    "FROM generate_series(1, 200) g",
+
+    "INSERT INTO event_participants (event_id, participant_phone, joined_at) "
+    "SELECT e.id, '+0' || lpad(((e.id * k) % :users + 1)::text, 10, '0'), now() "
+    "FROM events e, generate_series(1, 3) k "
+    "WHERE e.name LIKE 'Plan event %' "
+    "ON CONFLICT DO NOTHING",
+
+    LINK_USER_INTERESTS_SQL,
+    LINK_EVENT_INTERESTS_SQL,
+]
+
+PROBE_PHONE = "+00000000001"
+PROBE_TG_ID = 9000000001
+LONELY_PHONE = "+09999999999"
+
+# Number of statements a call may issue, independent of how many rows it returns
+QUERY_BUDGETS = {
+    "get_friends_events": (lambda session, phone: EventRepository(session).get_friends_events(phone), 1),
+}
+
+
+async def run_repository_queries(session: AsyncSession) -> None:
+    user_repo = UserRepository(session)
+    friend_repo = FriendRepository(session)
+    event_repo = EventRepository(session)
+    part_repo = ParticipantRepository(session)
+
+    await user_repo.get_by_tg_id(PROBE_TG_ID)
+    await user_repo.search_users(
+        current_phone=PROBE_PHONE,
+        gender="Муж",
+        region="Region 7",
+        age_range="20-30",
+        limit=11
+    )
+    await user_repo.search_users(
+        current_phone=PROBE_PHONE,
+        interests=["plan_interest_3", "plan_interest_21"],
+        limit=11
+    )
+    await friend_repo.get_friends(PROBE_TG_ID)
+    await friend_repo.get_incoming_requests(PROBE_TG_ID, limit=11)
+    await friend_repo.get_incoming_requests(PROBE_TG_ID, after_id=PROBE_TG_ID, limit=11)
+    await friend_repo.friend_set(PROBE_TG_ID, [PROBE_TG_ID + k for k in range(1, 20)])
+    await event_repo.get_friends_events(PROBE_PHONE)
+    await event_repo.get_my_events(PROBE_PHONE)
+    await part_repo.get_participants(1)
+
+
+async def check_query_budgets(conn) -> int:
+    failures = 0
+    for name, (call, budget) in QUERY_BUDGETS.items():
+        counts = []
+        for phone in (LONELY_PHONE, PROBE_PHONE):
+            statements = []
+
+            def count(connection, cursor, statement, parameters, context, executemany):
+                if statement.lstrip().upper().startswith("SELECT"):
+                    statements.append(statement)
+
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            event.listen(engine.sync_engine, "before_cursor_execute", count)
+            try:
+                rows = await call(session, phone)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", count)
+            counts.append((len(rows), len(statements)))
+
+        if any(queries > budget for _, queries in counts):
+            failures += 1
+            details = ", ".join(f"{rows} строк -> {queries} запросов" for rows, queries in counts)
+            print(f"\n❌ {name}: превышен лимит в {budget} запрос(а): {details}")
+    return failures
+
+
+def find_seq_scans(plan: dict) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in WATCHED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def check_query_plans() -> int:
+    captured = []
+    capturing = True
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.run_sync(Base.metadata.create_all)
+            await run_migrations(conn)
+
+            print("🌱 Заполнение тестовыми данными...")
+            for statement in SEED_SQL:
+                await conn.execute(text(statement), {"users": SEED_USERS, "events": SEED_EVENTS})
+            for table in sorted(WATCHED_TABLES):
+                await conn.execute(text(f"ANALYZE {table}"))
+
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            try:
+                session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+                await run_repository_queries(session)
+            finally:
+                capturing = False
+                event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+            failures = 0
+            for statement, parameters in captured:
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                seq_scans = find_seq_scans(plan[0]["Plan"])
+                if seq_scans:
+                    failures += 1
+                    print(f"\n❌ Seq Scan по {', '.join(sorted(set(seq_scans)))}:\n{statement}")
+
+            print(f"\nПроверено запросов: {len(captured)}, с Seq Scan: {failures}")
+
+            budget_failures = await check_query_budgets(conn)
+            print(f"Проверено лимитов запросов: {len(QUERY_BUDGETS)}, превышено: {budget_failures}")
+            return 1 if failures or budget_failures else 0
+        finally:
+            await trans.rollback()
+
+
+async def main():
+    try:
+        return await check_query_plans()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
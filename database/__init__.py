@@ -1,15 +1,19 @@
-from .db_config import engine, Base, DATABASE_URL
-from .session import get_session, async_session_maker
+from .db_config import engine, replica_engine, Base, DATABASE_URL, pool_stats
+from .session import get_session, session_scope, async_session_maker
 from .models import (
     User, Event, EventParticipant, EventInvite,
-    Friend, FriendRequest, Interest, Region
+    Friend, FriendRequest, Interest, Region,
+    UserInterest, EventInterest, FsmState
 )
 
 __all__ = [
     "engine",
+    "replica_engine",
     "Base",
     "DATABASE_URL",
+    "pool_stats",
     "get_session",
+    "session_scope",
     "async_session_maker",
     "User",
     "Event",
@@ -19,4 +23,7 @@ __all__ = [
     "FriendRequest",
     "Interest",
     "Region",
+    "UserInterest",
+    "EventInterest",
+    "FsmState",
 ]
@@ -0,0 +1,240 @@
+import asyncio
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+MISSING = object()
+
+
+class TTLCache:
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        item = self._data.get(key)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._data[key]
+                self._on_evict(key, item[1])
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        previous = self._data.get(key)
+        if previous is not None:
+            self._on_evict(key, previous[1])
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            key, (_, value) = self._data.popitem(last=False)
+            self.evictions += 1
+            self._on_evict(key, value)
+
+    def _on_evict(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def pop(self, key: Hashable) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._on_evict(key, item[1])
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[0] >= time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class UserCache(TTLCache):
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self._phone_index: dict[str, int] = {}
+        self.version = 0
+
+    def get_user(self, tg_id: int) -> Any:
+        user = self.get(tg_id)
+        if user is MISSING:
+            return MISSING
+        return dict(user) if user is not None else None
+
+    def set_user(self, tg_id: int, user: Optional[dict], version: Optional[int] = None) -> None:
+        if version is not None and version != self.version:
+            return
+        self.set(tg_id, dict(user) if user is not None else None)
+        if tg_id in self._data and user is not None and user.get("number"):
+            self._phone_index[user["number"]] = tg_id
+
+    def _on_evict(self, key: Hashable, value: Any) -> None:
+        if value is not None and self._phone_index.get(value.get("number")) == key:
+            del self._phone_index[value["number"]]
+
+    def invalidate(self, tg_id: Optional[int] = None, phone: Optional[str] = None) -> None:
+        self.version += 1
+        if phone is not None:
+            indexed = self._phone_index.pop(phone, None)
+            if indexed is not None:
+                self.pop(indexed)
+        if tg_id is not None:
+            self.pop(tg_id)
+
+    def clear(self) -> None:
+        super().clear()
+        self._phone_index.clear()
+
+
+user_cache = UserCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "60")),
+)
+
+
+def invalidate_user_on_commit(session, tg_id: Optional[int] = None, phone: Optional[str] = None) -> None:
+    user_cache.invalidate(tg_id=tg_id, phone=phone)
+    session.info.setdefault("invalidate_users", []).append((tg_id, phone))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for tg_id, phone in session.info.pop("invalidate_users", []):
+        user_cache.invalidate(tg_id=tg_id, phone=phone)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_invalidations(session: Session) -> None:
+    session.info.pop("invalidate_users", None)
+
+
+class ReferenceSnapshot(NamedTuple):
+    interests: List[str]
+    regions: List[str]
+    interest_names: Dict[int, str]
+    region_names: Dict[int, str]
+    interest_indexes: Dict[str, int]
+    interest_token: str
+
+
+REFERENCE_CHECK_INTERVAL = float(os.getenv("REFERENCE_CHECK_INTERVAL", "30"))
+
+
+class ReferenceDataCache:
+
+    def __init__(self, check_interval: float = REFERENCE_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self.version = 0
+
+    async def get(self) -> ReferenceSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return snapshot
+
+            # Imports on another replica only invalidate their own process, so a stale
+            # snapshot is revalidated against row counts and max ids; SERIAL ids never
+            # repeat, so any insert or delete changes the pair
+            version = self.version
+            fingerprint, snapshot = await self._load(snapshot, self._fingerprint)
+            if version == self.version:
+                self._snapshot = snapshot
+                self._fingerprint = fingerprint
+                self._checked_at = time.monotonic()
+            return snapshot
+
+    async def get_interests(self) -> List[str]:
+        return (await self.get()).interests
+
+    async def get_regions(self) -> List[str]:
+        return (await self.get()).regions
+
+    async def _load(self, snapshot: Optional[ReferenceSnapshot], fingerprint):
+        from .session import get_session
+        from .repositories import InterestRepository, RegionRepository
+
+        async with get_session() as session:
+            interest_repo = InterestRepository(session)
+            region_repo = RegionRepository(session)
+            current = (await interest_repo.fingerprint(), await region_repo.fingerprint())
+            if snapshot is not None and current == fingerprint:
+                return current, snapshot
+
+            interest_names = await interest_repo.get_name_map()
+            region_names = await region_repo.get_name_map()
+
+        # Selection bitsets are indexed by dense catalogue positions rather than SERIAL ids,
+        # which can be huge after years of imports. Positions shift when an interest is
+        # removed, so masks and buttons carry interest_token, derived from the id set, and
+        # are discarded when it no longer matches
+        index_by_id = {id: index for index, id in enumerate(sorted(interest_names))}
+        names_by_index = {index_by_id[id]: name for id, name in interest_names.items()}
+
+        return current, ReferenceSnapshot(
+            interests=list(interest_names.values()),
+            regions=list(region_names.values()),
+            interest_names=names_by_index,
+            region_names=region_names,
+            interest_indexes={name: index for index, name in names_by_index.items()},
+            interest_token=f"{zlib.crc32(','.join(map(str, sorted(interest_names))).encode()):08x}",
+        )
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._snapshot = None
+        self._fingerprint = None
+
+
+reference_data = ReferenceDataCache()
+
+
+def invalidate_reference_data_on_commit(session) -> None:
+    reference_data.invalidate()
+    session.info["invalidate_reference_data"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_reference_data(session: Session) -> None:
+    if session.info.pop("invalidate_reference_data", False):
+        reference_data.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_reference_invalidation(session: Session) -> None:
+    session.info.pop("invalidate_reference_data", None)
@@ -0,0 +1,41 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import CreateIndex
+
+from .db_config import Base, EVENT_TIMEZONE
+from .repositories.interest import LINK_USER_INTERESTS_SQL, LINK_EVENT_INTERESTS_SQL
+
+MIGRATIONS = [
+    (
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS starts_at TIMESTAMPTZ",
+        {},
+    ),
+    (
+        "UPDATE events "
+        "SET starts_at = to_timestamp(date || ' ' || time, 'DD.MM.YYYY HH24:MI')::timestamp "
+        "AT TIME ZONE :tz "
+        "WHERE starts_at IS NULL "
+        "AND date ~ '^[0-9]{1,2}\\.[0-9]{1,2}\\.[0-9]{4}$' "
+        "AND time ~ '^[0-9]{1,2}:[0-9]{2}$'",
+        {"tz": EVENT_TIMEZONE},
+    ),
+]
+
+BACKFILLS = [
+    ("user_interests", LINK_USER_INTERESTS_SQL),
+    ("event_interests", LINK_EVENT_INTERESTS_SQL),
+]
+
+
+async def run_migrations(conn: AsyncConnection) -> None:
+    for statement, params in MIGRATIONS:
+        await conn.execute(text(statement), params)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            await conn.execute(CreateIndex(index, if_not_exists=True))
+
+    for table, statement in BACKFILLS:
+        result = await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})"))
+        if not result.scalar():
+            await conn.execute(text(statement))
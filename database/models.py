@@ -3,8 +3,9 @@ from typing import Optional, List
 
 from sqlalchemy import (
     String, Integer, BigInteger, Float, Text, DateTime, ForeignKey, 
-    CheckConstraint, UniqueConstraint
+    CheckConstraint, UniqueConstraint, Index
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .db_config import Base
@@ -44,6 +45,7 @@ class User(Base):
     
     __table_args__ = (
         CheckConstraint("role IN ('admin', 'user')", name="check_role"),
+        Index("ix_users_search", "registered", "region", "gender", "age"),
     )
     
     def to_dict(self) -> dict:
@@ -77,6 +79,11 @@ class Event(Base):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     date: Mapped[str] = mapped_column(String(10), nullable=False)  
     time: Mapped[str] = mapped_column(String(5), nullable=False)   
+    starts_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True
+    )
     interests: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  
     address: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -103,6 +110,10 @@ class Event(Base):
         cascade="all, delete-orphan"
     )
     
+    __table_args__ = (
+        Index("ix_events_organizer_starts", "organizer_phone", "starts_at"),
+    )
+    
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -110,6 +121,7 @@ class Event(Base):
             "name": self.name,
             "date": self.date,
             "time": self.time,
+            "starts_at": self.starts_at,
             "interests": self.interests,
             "address": self.address,
             "latitude": self.latitude,
@@ -141,6 +153,10 @@ class EventParticipant(Base):
     
     event: Mapped["Event"] = relationship(back_populates="participants")
     participant: Mapped["User"] = relationship(foreign_keys=[participant_phone])
+    
+    __table_args__ = (
+        Index("ix_event_participants_phone_event", "participant_phone", "event_id"),
+    )
 
 
 class EventInvite(Base):
@@ -169,6 +185,10 @@ class EventInvite(Base):
     
     event: Mapped["Event"] = relationship(back_populates="invites")
     invited_user: Mapped["User"] = relationship(foreign_keys=[invited_phone])
+    
+    __table_args__ = (
+        Index("ix_event_invites_phone_event", "invited_phone", "event_id"),
+    )
 
 
 class Friend(Base):
@@ -181,6 +201,10 @@ class Friend(Base):
         default=datetime.utcnow,
         nullable=False
     )
+    
+    __table_args__ = (
+        Index("ix_friends_friend_user", "friend_id", "user_id"),
+    )
 
 
 class FriendRequest(Base):
@@ -194,6 +218,10 @@ class FriendRequest(Base):
         nullable=False
     )
     message_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_friend_requests_to_from", "to_user_id", "from_user_id"),
+    )
 
 
 class Interest(Base):
@@ -208,3 +236,54 @@ class Region(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+
+
+class UserInterest(Base):
+    __tablename__ = "user_interests"
+    
+    user_number: Mapped[str] = mapped_column(
+        String(20),
+        ForeignKey("users.number", ondelete="CASCADE"),
+        primary_key=True
+    )
+    interest_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("interests.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    __table_args__ = (
+        Index("ix_user_interests_interest_user", "interest_id", "user_number"),
+    )
+
+
+class EventInterest(Base):
+    __tablename__ = "event_interests"
+    
+    event_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("events.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    interest_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("interests.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    
+    __table_args__ = (
+        Index("ix_event_interests_interest_event", "interest_id", "event_id"),
+    )
+
+
+class FsmState(Base):
+    __tablename__ = "fsm_states"
+    
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    state: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_fsm_states_expires_at", "expires_at"),
+    )
@@ -1,4 +1,5 @@
 from .base import AsyncRepository
+from .reference import ReferenceRepository
 from .user import UserRepository
 from .friend import FriendRepository
 from .event import EventRepository
@@ -9,6 +10,7 @@ from .region import RegionRepository
 
 __all__ = [
     "AsyncRepository",
+    "ReferenceRepository",
     "UserRepository",
     "FriendRepository",
     "EventRepository",
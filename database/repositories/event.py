@@ -1,13 +1,24 @@
-from typing import Optional, List, Tuple
+from datetime import datetime
+from typing import Optional, List, Tuple, AsyncIterator
+from zoneinfo import ZoneInfo
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, literal, and_, or_, func, case, exists, union
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import User, Event, EventParticipant, Friend
+from ..db_config import EVENT_TIMEZONE
+from ..models import User, Event, EventParticipant, Friend, Interest, EventInterest
 from .base import AsyncRepository
 
 
+def event_starts_at(date: Optional[str], time: Optional[str]) -> Optional[datetime]:
+    try:
+        naive = datetime.strptime(f"{date} {time}", "%d.%m.%Y %H:%M")
+    except (TypeError, ValueError):
+        return None
+    return naive.replace(tzinfo=ZoneInfo(EVENT_TIMEZONE))
+
+
 class EventRepository(AsyncRepository[Event]):
     
     def __init__(self, session: AsyncSession):
@@ -23,6 +34,7 @@ class EventRepository(AsyncRepository[Event]):
                 name=data.get("name"),
                 date=data.get("date"),
                 time=data.get("time"),
+                starts_at=event_starts_at(data.get("date"), data.get("time")),
                 interests=interests_str,
                 address=data.get("address"),
                 latitude=data.get("latitude"),
@@ -40,6 +52,14 @@ class EventRepository(AsyncRepository[Event]):
             self.session.add(participant)
             await self.session.flush()
             
+            if interests:
+                await self.session.execute(
+                    insert(EventInterest).from_select(
+                        ["event_id", "interest_id"],
+                        select(literal(event.id), Interest.id).where(Interest.name.in_(interests))
+                    )
+                )
+            
             return event.id
         except Exception:
             return None
@@ -61,61 +81,39 @@ class EventRepository(AsyncRepository[Event]):
         return event_dict
     
     async def get_friends_events(self, user_phone: str) -> List[Tuple]:
-        result = await self.session.execute(
-            select(User.tg_id).where(User.number == user_phone)
-        )
-        user_tg_id_row = result.one_or_none()
-        if not user_tg_id_row:
-            return []
-        user_tg_id = user_tg_id_row[0]
-        
-        result = await self.session.execute(
-            select(Friend.friend_id).where(Friend.user_id == user_tg_id)
+        user_tg_id = (
+            select(User.tg_id).where(User.number == user_phone).scalar_subquery()
         )
-        friend_ids_1 = [row[0] for row in result.all()]
-        
-        result = await self.session.execute(
-            select(Friend.user_id).where(Friend.friend_id == user_tg_id)
+        friend_ids = union(
+            select(Friend.friend_id.label("tg_id")).where(Friend.user_id == user_tg_id),
+            select(Friend.user_id.label("tg_id")).where(Friend.friend_id == user_tg_id)
+        ).subquery()
+        is_participant = exists().where(
+            and_(
+                EventParticipant.event_id == Event.id,
+                EventParticipant.participant_phone == user_phone
+            )
         )
-        friend_ids_2 = [row[0] for row in result.all()]
-        
-        friend_tg_ids = set(friend_ids_1 + friend_ids_2)
-        
-        if not friend_tg_ids:
-            return []
         
         result = await self.session.execute(
             select(
                 Event.id, Event.name, Event.date, Event.time,
                 Event.address, Event.interests, Event.description,
-                Event.organizer_phone, Event.latitude, Event.longitude
+                Event.organizer_phone, Event.latitude, Event.longitude,
+                User.name, User.surname,
+                case((is_participant, 1), else_=0)
             )
             .join(User, Event.organizer_phone == User.number)
+            .join(friend_ids, friend_ids.c.tg_id == User.tg_id)
             .where(
                 and_(
                     Event.organizer_phone != user_phone,
-                    User.tg_id.in_(friend_tg_ids)
+                    Event.starts_at >= func.now()
                 )
             )
-            .order_by(Event.date, Event.time)
+            .order_by(Event.starts_at)
         )
-        events = result.all()
-        
-        events_with_participation = []
-        for event in events:
-            event_id = event[0]
-            part_result = await self.session.execute(
-                select(EventParticipant).where(
-                    and_(
-                        EventParticipant.event_id == event_id,
-                        EventParticipant.participant_phone == user_phone
-                    )
-                )
-            )
-            is_participant = 1 if part_result.scalar_one_or_none() else 0
-            events_with_participation.append((*event, is_participant))
-        
-        return events_with_participation
+        return [tuple(row) for row in result.all()]
     
     async def get_my_events(self, user_phone: str) -> Tuple[List, List]:
  
@@ -123,10 +121,17 @@ class EventRepository(AsyncRepository[Event]):
             select(
                 Event.id, Event.name, Event.date, Event.time,
                 Event.address, Event.interests, Event.description,
-                Event.organizer_phone, Event.latitude, Event.longitude
+                Event.organizer_phone, Event.latitude, Event.longitude,
+                User.name, User.surname
+            )
+            .join(User, Event.organizer_phone == User.number)
+            .where(
+                and_(
+                    Event.organizer_phone == user_phone,
+                    Event.starts_at >= func.now()
+                )
             )
-            .where(Event.organizer_phone == user_phone)
-            .order_by(Event.created_at.desc())
+            .order_by(Event.starts_at)
         )
         organized_raw = result.all()
         organized = [(*e, 1, 0) for e in organized_raw]  
@@ -135,18 +140,36 @@ class EventRepository(AsyncRepository[Event]):
             select(
                 Event.id, Event.name, Event.date, Event.time,
                 Event.address, Event.interests, Event.description,
-                Event.organizer_phone, Event.latitude, Event.longitude
+                Event.organizer_phone, Event.latitude, Event.longitude,
+                User.name, User.surname
             )
+            .join(User, Event.organizer_phone == User.number)
             .join(EventParticipant, Event.id == EventParticipant.event_id)
             .where(
                 and_(
                     EventParticipant.participant_phone == user_phone,
-                    Event.organizer_phone != user_phone
+                    Event.organizer_phone != user_phone,
+                    Event.starts_at >= func.now()
                 )
             )
-            .order_by(Event.created_at.desc())
+            .order_by(Event.starts_at)
         )
         participated_raw = result.all()
         participated = [(*e, 0, 1) for e in participated_raw]  
         
         return organized, participated
+    
+    async def stream_report_rows(self, chunk_size: int = 1000) -> AsyncIterator[List[Tuple]]:
+        result = await self.session.stream(
+            select(
+                Event.id, Event.name, Event.date, Event.time,
+                Event.interests, Event.address, Event.description,
+                Event.organizer_phone, func.count(EventParticipant.participant_phone)
+            )
+            .outerjoin(EventParticipant, EventParticipant.event_id == Event.id)
+            .group_by(Event.id)
+            .order_by(Event.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions():
+            yield [tuple(row) for row in partition]
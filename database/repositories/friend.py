@@ -1,29 +1,37 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 
-from sqlalchemy import select, delete, and_
+from sqlalchemy import select, delete, func, and_, exists, literal, union_all, BigInteger
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import User, Friend, FriendRequest
 from .base import AsyncRepository
 
 
+FRIEND_STATUS = "friend"
+REQUEST_SENT_STATUS = "request_sent"
+REQUEST_RECEIVED_STATUS = "request_received"
+
+STATUS_PRIORITY = {
+    FRIEND_STATUS: 0,
+    REQUEST_SENT_STATUS: 1,
+    REQUEST_RECEIVED_STATUS: 2,
+}
+
+
 class FriendRepository(AsyncRepository[Friend]):
     
     def __init__(self, session: AsyncSession):
         super().__init__(Friend, session)
     
     async def add_friend(self, user_id: int, friend_id: int) -> bool:
-        existing = await self.session.execute(
-            select(Friend).where(
-                and_(Friend.user_id == user_id, Friend.friend_id == friend_id)
-            )
+        result = await self.session.execute(
+            insert(Friend)
+            .values(user_id=user_id, friend_id=friend_id)
+            .on_conflict_do_nothing()
+            .returning(Friend.user_id)
         )
-        if existing.scalar_one_or_none():
-            return False
-        
-        friend = Friend(user_id=user_id, friend_id=friend_id)
-        await self.add(friend)
-        return True
+        return result.first() is not None
     
     async def get_friends(self, user_id: int) -> List[dict]:
         result = await self.session.execute(
@@ -60,6 +68,37 @@ class FriendRepository(AsyncRepository[Friend]):
         )
         return result.scalar_one_or_none() is not None
     
+    async def friend_set(self, user_id: int, candidate_ids: List[int]) -> Dict[int, str]:
+        if not candidate_ids:
+            return {}
+        
+        result = await self.session.execute(
+            union_all(
+                select(Friend.friend_id, literal(FRIEND_STATUS)).where(
+                    and_(Friend.user_id == user_id, Friend.friend_id.in_(candidate_ids))
+                ),
+                select(FriendRequest.to_user_id, literal(REQUEST_SENT_STATUS)).where(
+                    and_(
+                        FriendRequest.from_user_id == user_id,
+                        FriendRequest.to_user_id.in_(candidate_ids)
+                    )
+                ),
+                select(FriendRequest.from_user_id, literal(REQUEST_RECEIVED_STATUS)).where(
+                    and_(
+                        FriendRequest.to_user_id == user_id,
+                        FriendRequest.from_user_id.in_(candidate_ids)
+                    )
+                )
+            )
+        )
+        
+        relations = {}
+        for candidate_id, status in result.all():
+            current = relations.get(candidate_id)
+            if current is None or STATUS_PRIORITY[status] < STATUS_PRIORITY[current]:
+                relations[candidate_id] = status
+        return relations
+    
     async def delete_friend(self, user_id: int, friend_id: int) -> None:
         await self.session.execute(
             delete(Friend).where(
@@ -74,64 +113,69 @@ class FriendRepository(AsyncRepository[Friend]):
     
     
     async def send_request(self, from_user_id: int, to_user_id: int) -> str:
-        if await self.is_friend(from_user_id, to_user_id):
-            return "already_friends"
-        
-        existing = await self.session.execute(
-            select(FriendRequest).where(
-                and_(
-                    FriendRequest.from_user_id == from_user_id,
-                    FriendRequest.to_user_id == to_user_id
-                )
+        already_friends = exists().where(
+            and_(Friend.user_id == from_user_id, Friend.friend_id == to_user_id)
+        )
+        result = await self.session.execute(
+            insert(FriendRequest)
+            .from_select(
+                ["from_user_id", "to_user_id"],
+                select(
+                    literal(from_user_id, BigInteger),
+                    literal(to_user_id, BigInteger)
+                ).where(~already_friends)
             )
+            .on_conflict_do_nothing()
+            .returning(FriendRequest.from_user_id)
         )
-        if existing.scalar_one_or_none():
-            return "already_sent"
-        
-        try:
-            request = FriendRequest(from_user_id=from_user_id, to_user_id=to_user_id)
-            self.session.add(request)
-            await self.session.flush()
+        if result.first() is not None:
             return "ok"
-        except Exception:
-            return "error"
+        
+        if await self.is_friend(from_user_id, to_user_id):
+            return "already_friends"
+        return "already_sent"
     
-    async def get_incoming_requests(self, user_id: int) -> List[dict]:
-        result = await self.session.execute(
-            select(FriendRequest.from_user_id).where(
-                FriendRequest.to_user_id == user_id
+    async def get_incoming_requests(
+        self,
+        user_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        already_friends = exists().where(
+            and_(
+                Friend.user_id == user_id,
+                Friend.friend_id == FriendRequest.from_user_id
             )
         )
-        requester_ids = [row[0] for row in result.all()]
-        
-        if not requester_ids:
-            return []
+        conditions = [FriendRequest.to_user_id == user_id, ~already_friends]
+        if after_id is not None:
+            conditions.append(FriendRequest.from_user_id > after_id)
         
-        friend_result = await self.session.execute(
-            select(Friend.friend_id).where(Friend.user_id == user_id)
+        query = (
+            select(
+                User.tg_id, User.name, User.surname, User.age,
+                User.region, User.interests, User.photo_file_id
+            )
+            .select_from(FriendRequest)
+            .join(User, User.tg_id == FriendRequest.from_user_id)
+            .where(and_(*conditions))
+            .order_by(FriendRequest.from_user_id)
         )
-        friend_ids = {row[0] for row in friend_result.all()}
-        
-        requester_ids = [rid for rid in requester_ids if rid not in friend_ids]
-        
-        if not requester_ids:
-            return []
+        if limit is not None:
+            query = query.limit(limit)
         
-        result = await self.session.execute(
-            select(User).where(User.tg_id.in_(requester_ids))
-        )
-        users = result.scalars().all()
+        result = await self.session.execute(query)
         
         requests = []
-        for user in users:
+        for tg_id, name, surname, age, region, interests, photo in result.all():
             requests.append({
-                "tg_id": user.tg_id,
-                "name": user.name,
-                "surname": user.surname,
-                "age": user.age,
-                "region": user.region,
-                "interests": user.interests,
-                "photo": user.photo_file_id
+                "tg_id": tg_id,
+                "name": name,
+                "surname": surname,
+                "age": age,
+                "region": region,
+                "interests": interests,
+                "photo": photo
             })
         return requests
     
@@ -163,48 +207,52 @@ class FriendRepository(AsyncRepository[Friend]):
             return False
 
     async def accept_request(self, user_id: int, requester_id: int) -> Optional[int]:
-        try:
-            friend1 = Friend(user_id=user_id, friend_id=requester_id)
-            friend2 = Friend(user_id=requester_id, friend_id=user_id)
-            self.session.add(friend1)
-            self.session.add(friend2)
-            
-            await self.session.execute(
-                delete(FriendRequest).where(
-                    and_(
-                        FriendRequest.from_user_id == requester_id,
-                        FriendRequest.to_user_id == user_id
-                    )
+        # One statement: the incoming request is consumed, the reverse request (if any) is
+        # dropped and both friendship rows are written only when the request existed
+        accepted = (
+            delete(FriendRequest)
+            .where(
+                and_(
+                    FriendRequest.from_user_id == requester_id,
+                    FriendRequest.to_user_id == user_id
                 )
             )
-            
-            reverse_req_result = await self.session.execute(
-                select(FriendRequest.message_id).where(
-                    and_(
-                        FriendRequest.from_user_id == user_id,
-                        FriendRequest.to_user_id == requester_id
-                    )
+            .returning(FriendRequest.from_user_id)
+            .cte("accepted")
+        )
+        reverse = (
+            delete(FriendRequest)
+            .where(
+                and_(
+                    FriendRequest.from_user_id == user_id,
+                    FriendRequest.to_user_id == requester_id,
+                    exists(select(1).select_from(accepted))
                 )
             )
-            reverse_msg_id = reverse_req_result.scalar_one_or_none()
-            
-            if reverse_msg_id is not None:
-                await self.session.execute(
-                    delete(FriendRequest).where(
-                        and_(
-                            FriendRequest.from_user_id == user_id,
-                            FriendRequest.to_user_id == requester_id
-                        )
-                    )
-                )
-                await self.session.flush()
-                return reverse_msg_id
-            
-            await self.session.flush()
-            return 0
-            
-        except Exception:
+            .returning(FriendRequest.message_id)
+            .cte("reverse_request")
+        )
+        pairs = union_all(
+            select(literal(user_id, BigInteger), literal(requester_id, BigInteger)).select_from(accepted),
+            select(literal(requester_id, BigInteger), literal(user_id, BigInteger)).select_from(accepted),
+        ).subquery("pairs")
+        befriended = (
+            insert(Friend)
+            .from_select(["user_id", "friend_id"], select(pairs))
+            .on_conflict_do_nothing()
+            .cte("befriended")
+        )
+        
+        result = await self.session.execute(
+            select(
+                select(func.count()).select_from(accepted).scalar_subquery(),
+                select(reverse.c.message_id).scalar_subquery(),
+            ).add_cte(befriended)
+        )
+        accepted_count, reverse_msg_id = result.one()
+        if not accepted_count:
             return None
+        return reverse_msg_id or 0
     
     async def decline_request(self, user_id: int, requester_id: int) -> None:
         await self.session.execute(
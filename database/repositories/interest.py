@@ -1,31 +1,44 @@
 from typing import List
 
-from sqlalchemy import select, delete
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import Interest
-from .base import AsyncRepository
+from .reference import ReferenceRepository
 
 
-class InterestRepository(AsyncRepository[Interest]):
+LINK_USER_INTERESTS_SQL = """
+INSERT INTO user_interests (user_number, interest_id)
+SELECT u.number, i.id
+FROM users u
+CROSS JOIN LATERAL unnest(string_to_array(u.interests, ',')) AS t(name)
+JOIN interests i ON i.name = btrim(t.name)
+WHERE u.interests IS NOT NULL
+ON CONFLICT DO NOTHING
+"""
+
+LINK_EVENT_INTERESTS_SQL = """
+INSERT INTO event_interests (event_id, interest_id)
+SELECT e.id, i.id
+FROM events e
+CROSS JOIN LATERAL unnest(string_to_array(e.interests, ',')) AS t(name)
+JOIN interests i ON i.name = btrim(t.name)
+WHERE e.interests IS NOT NULL
+ON CONFLICT DO NOTHING
+"""
+
+
+class InterestRepository(ReferenceRepository[Interest]):
     
     def __init__(self, session: AsyncSession):
         super().__init__(Interest, session)
     
-    async def get_all_names(self) -> List[str]:
-        result = await self.session.execute(
-            select(Interest.name).order_by(Interest.name)
-        )
-        interests = [row[0] for row in result.all()]
-        return interests
+    async def replace_all(self, interests: List[str]) -> List[str]:
+        added = await super().replace_all(interests)
+        if added:
+            await self.relink_all()
+        return added
     
-    async def replace_all(self, interests: List[str]) -> None:
-        await self.session.execute(delete(Interest))
-        
-        for name in interests:
-            name = name.strip()
-            if name:
-                interest = Interest(name=name)
-                self.session.add(interest)
-        
-        await self.session.flush()
+    async def relink_all(self) -> None:
+        await self.session.execute(text(LINK_USER_INTERESTS_SQL))
+        await self.session.execute(text(LINK_EVENT_INTERESTS_SQL))
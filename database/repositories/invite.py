@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Optional, List
 
-from sqlalchemy import select, update, and_
+from sqlalchemy import select, update, and_, literal
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import EventInvite
+from ..models import User, EventInvite
 from .base import AsyncRepository
 
 
@@ -13,27 +14,33 @@ class InviteRepository(AsyncRepository[EventInvite]):
         super().__init__(EventInvite, session)
     
     async def create_invite(self, event_id: int, phone: str) -> bool:
-        existing = await self.session.execute(
-            select(EventInvite).where(
-                and_(
-                    EventInvite.event_id == event_id,
-                    EventInvite.invited_phone == phone
-                )
-            )
+        result = await self.session.execute(
+            insert(EventInvite)
+            .values(event_id=event_id, invited_phone=phone, status="pending")
+            .on_conflict_do_nothing()
+            .returning(EventInvite.event_id)
         )
-        if existing.scalar_one_or_none():
-            return False
+        return result.first() is not None
+    
+    async def create_invites(self, event_id: int, tg_ids: List[int]) -> List[int]:
+        if not tg_ids:
+            return []
         
-        try:
-            invite = EventInvite(
-                event_id=event_id,
-                invited_phone=phone,
-                status="pending"
+        inserted = (
+            insert(EventInvite)
+            .from_select(
+                ["event_id", "invited_phone", "status"],
+                select(literal(event_id), User.number, literal("pending"))
+                .where(User.tg_id.in_(tg_ids))
             )
-            await self.add(invite)
-            return True
-        except Exception:
-            return False
+            .on_conflict_do_nothing()
+            .returning(EventInvite.invited_phone)
+            .cte("inserted")
+        )
+        result = await self.session.execute(
+            select(User.tg_id).join(inserted, inserted.c.invited_phone == User.number)
+        )
+        return [row[0] for row in result.all()]
     
     async def get_status(self, event_id: int, phone: str) -> Optional[str]:
         result = await self.session.execute(
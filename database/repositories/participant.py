@@ -1,6 +1,7 @@
 from typing import Optional, List, Tuple
 
-from sqlalchemy import select, delete, and_
+from sqlalchemy import select, update, delete, and_, literal
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import User, Event, EventParticipant, EventInvite
@@ -13,39 +14,35 @@ class ParticipantRepository(AsyncRepository[EventParticipant]):
         super().__init__(EventParticipant, session)
     
     async def join_event(self, event_id: int, phone: str) -> Tuple[bool, Optional[str]]:
-    
-        existing = await self.session.execute(
-            select(EventParticipant).where(
-                and_(
-                    EventParticipant.event_id == event_id,
-                    EventParticipant.participant_phone == phone
-                )
+        result = await self.session.execute(
+            insert(EventParticipant)
+            .from_select(
+                ["event_id", "participant_phone"],
+                select(Event.id, literal(phone)).where(Event.id == event_id)
             )
+            .on_conflict_do_nothing()
+            .returning(EventParticipant.event_id)
         )
-        if existing.scalar_one_or_none():
+        if result.first() is None:
+            event_exists = await self.session.execute(
+                select(Event.id).where(Event.id == event_id)
+            )
+            if event_exists.first() is None:
+                return False, "not_found"
             return False, "already_joined"
         
-        try:
-            participant = EventParticipant(
-                event_id=event_id,
-                participant_phone=phone
-            )
-            await self.add(participant)
-            
-            await self.session.execute(
-                EventInvite.__table__.update()
-                .where(
-                    and_(
-                        EventInvite.event_id == event_id,
-                        EventInvite.invited_phone == phone
-                    )
+        await self.session.execute(
+            update(EventInvite)
+            .where(
+                and_(
+                    EventInvite.event_id == event_id,
+                    EventInvite.invited_phone == phone
                 )
-                .values(status="accepted")
             )
-            
-            return True, None
-        except Exception as e:
-            return False, str(e)
+            .values(status="accepted")
+        )
+        
+        return True, None
     
     async def leave_event(
         self, event_id: int, phone: str
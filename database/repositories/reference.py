@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import select, delete, func, literal, any_, String
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+
+from ..cache import invalidate_reference_data_on_commit
+from ..models import Interest, Region
+from .base import AsyncRepository
+
+R = TypeVar("R", Interest, Region)
+
+
+class ReferenceRepository(AsyncRepository[R]):
+    
+    async def get_all_names(self) -> List[str]:
+        result = await self.session.execute(
+            select(self.model.name).order_by(self.model.name)
+        )
+        return [row[0] for row in result.all()]
+    
+    async def get_name_map(self) -> Dict[int, str]:
+        result = await self.session.execute(
+            select(self.model.id, self.model.name).order_by(self.model.name)
+        )
+        return {id: name for id, name in result.all()}
+    
+    async def fingerprint(self) -> Tuple[int, Optional[int]]:
+        result = await self.session.execute(
+            select(func.count(), func.max(self.model.id)).select_from(self.model)
+        )
+        count, max_id = result.one()
+        return count, max_id
+    
+    async def replace_all(self, names: List[str]) -> List[str]:
+        wanted = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+        
+        result = await self.session.execute(select(self.model.name))
+        current = {row[0] for row in result.all()}
+        
+        added = [name for name in wanted if name not in current]
+        removed = current.difference(wanted)
+        
+        # Names travel as a single array parameter so list size is not bound by
+        # the driver's limit on bind parameters per statement
+        if removed:
+            await self.session.execute(
+                delete(self.model).where(
+                    self.model.name == any_(literal(sorted(removed), ARRAY(String)))
+                )
+            )
+        if added:
+            await self.session.execute(
+                insert(self.model)
+                .from_select(["name"], select(func.unnest(literal(added, ARRAY(String)))))
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+        if added or removed:
+            invalidate_reference_data_on_commit(self.session)
+        
+        return added
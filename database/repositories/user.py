@@ -1,10 +1,11 @@
 
-from typing import Optional, List
+from typing import Optional, List, Tuple, AsyncIterator
 
-from sqlalchemy import select, update, and_, or_
+from sqlalchemy import select, update, delete, insert, literal, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import User, Friend, FriendRequest
+from ..models import User, Friend, FriendRequest, Interest, UserInterest
+from ..cache import invalidate_user_on_commit
 from .base import AsyncRepository
 
 
@@ -47,6 +48,7 @@ class UserRepository(AsyncRepository[User]):
             registered=0
         )
         await self.add(user)
+        invalidate_user_on_commit(self.session, tg_id=tg_id, phone=phone)
         return True
     
     async def update_profile(self, phone: str, data: dict) -> bool:
@@ -70,8 +72,35 @@ class UserRepository(AsyncRepository[User]):
                 registered=1
             )
         )
+        await self.set_interests(phone, interests)
+        invalidate_user_on_commit(self.session, phone=phone)
         return True
     
+    async def set_interests(self, phone: str, interests: List[str]) -> None:
+        await self.session.execute(
+            delete(UserInterest).where(UserInterest.user_number == phone)
+        )
+        if interests:
+            await self.session.execute(
+                insert(UserInterest).from_select(
+                    ["user_number", "interest_id"],
+                    select(literal(phone), Interest.id).where(Interest.name.in_(interests))
+                )
+            )
+    
+    @staticmethod
+    def _interest_overlap(interests: List[str]):
+        return (
+            select(
+                UserInterest.user_number,
+                func.count().label("score")
+            )
+            .join(Interest, Interest.id == UserInterest.interest_id)
+            .where(Interest.name.in_(interests))
+            .group_by(UserInterest.user_number)
+            .subquery()
+        )
+    
     async def find_potential_friends(
         self, 
         organizer_phone: str, 
@@ -87,13 +116,14 @@ class UserRepository(AsyncRepository[User]):
         )
         
         if interests:
-            interest_conditions = [
-                User.interests.like(f"%{interest}%") 
-                for interest in interests
-            ]
-            query = query.where(or_(*interest_conditions))
+            overlap = self._interest_overlap(interests)
+            query = (
+                query
+                .join(overlap, overlap.c.user_number == User.number)
+                .order_by(overlap.c.score.desc())
+            )
         
-        result = await self.session.execute(query)
+        result = await self.session.execute(query.limit(20))
         users = result.scalars().all()
         
         friends = []
@@ -110,14 +140,7 @@ class UserRepository(AsyncRepository[User]):
                 "interests": user_interests
             })
         
-        if interests:
-            interests_set = set(interests)
-            friends.sort(
-                key=lambda f: len(interests_set & set(f["interests"])),
-                reverse=True
-            )
-        
-        return friends[:20]
+        return friends
     
     async def search_users(
         self,
@@ -125,10 +148,19 @@ class UserRepository(AsyncRepository[User]):
         gender: Optional[str] = None,
         region: Optional[str] = None,
         age_range: Optional[str] = None,
-        interests: Optional[List[str]] = None
+        interests: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[dict]:
         
-        query = select(User).where(
+        if interests:
+            overlap = self._interest_overlap(interests)
+            score = overlap.c.score
+            query = select(User, score).join(overlap, overlap.c.user_number == User.number)
+        else:
+            query = select(User, literal(0))
+        
+        query = query.where(
             and_(
                 User.registered == 1,
                 User.number != current_phone
@@ -149,19 +181,18 @@ class UserRepository(AsyncRepository[User]):
             except ValueError:
                 pass
         
+        if interests:
+            query = query.order_by(score.desc(), User.number)
+        else:
+            query = query.order_by(User.number)
+        
+        if limit is not None:
+            query = query.limit(limit).offset(offset)
+        
         result = await self.session.execute(query)
-        users = result.scalars().all()
         
-        user_interests = set(interests) if interests else set()
         results = []
-        
-        for user in users:
-            u_interests = set(user.interests.split(",")) if user.interests else set()
-            overlap = len(user_interests & u_interests) if user_interests else 0
-            
-            if interests and overlap == 0:
-                continue
-            
+        for user, overlap_score in result.all():
             results.append({
                 "tg_id": user.tg_id,
                 "name": user.name,
@@ -171,8 +202,23 @@ class UserRepository(AsyncRepository[User]):
                 "region": user.region,
                 "interests": user.interests,
                 "photo": user.photo_file_id,
-                "score": overlap
+                "score": overlap_score
             })
         
-        results.sort(key=lambda x: x["score"], reverse=True)
         return results
+    
+    async def count(self) -> int:
+        result = await self.session.execute(select(func.count()).select_from(User))
+        return result.scalar_one()
+    
+    async def stream_report_rows(self, chunk_size: int = 1000) -> AsyncIterator[List[Tuple]]:
+        result = await self.session.stream(
+            select(
+                User.number, User.role, User.name, User.surname, User.gender,
+                User.age, User.region, User.interests, User.photo_file_id
+            )
+            .order_by(User.number)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions():
+            yield [tuple(row) for row in partition]
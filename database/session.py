@@ -1,9 +1,14 @@
+import logging
+import os
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
 
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from .db_config import engine
+from .db_config import engine, replica_engine
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -12,9 +17,60 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+replica_session_maker = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+) if replica_engine is not None else None
+
+REPLICA_RETRY_AFTER = float(os.getenv("DB_REPLICA_RETRY_AFTER", "30"))
+
+_current_session: ContextVar[Optional[AsyncSession]] = ContextVar("current_session", default=None)
+_replica_down_until = 0.0
+
+
+async def _open_replica_session() -> Optional[AsyncSession]:
+    global _replica_down_until
+
+    if replica_session_maker is None or time.monotonic() < _replica_down_until:
+        return None
+
+    session = replica_session_maker()
+    try:
+        await session.connection()
+    except (OSError, exc.DBAPIError, exc.TimeoutError) as e:
+        await session.close()
+        _replica_down_until = time.monotonic() + REPLICA_RETRY_AFTER
+        logging.warning(f"Read replica unavailable, falling back to primary: {e}")
+        return None
+    return session
+
 
 @asynccontextmanager
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session(readonly: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    if readonly:
+        session = await _open_replica_session()
+        if session is not None:
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    session = _current_session.get()
+    if session is not None:
+        # Joined blocks commit on exit: writes are durable before the handler talks to
+        # Telegram, and the connection goes back to the pool during network I/O.
+        # expire_on_commit=False keeps the shared identity map usable afterwards
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return
+
     async with async_session_maker() as session:
         try:
             yield session
@@ -22,3 +78,13 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[AsyncSession, None]:
+    async with get_session() as session:
+        token = _current_session.set(session)
+        try:
+            yield session
+        finally:
+            _current_session.reset(token)
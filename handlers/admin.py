@@ -1,7 +1,6 @@
+import asyncio
+import io
 import logging
-import uuid
-import os
-from openpyxl import load_workbook
 from aiogram import Router, F, types
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
@@ -11,7 +10,10 @@ from keyboards.builders import get_admin_menu_keyboard
 
 from database import get_session
 from database.repositories import InterestRepository, RegionRepository
-from utils.excel import export_users_report, export_events_report
+from utils.excel import (
+    export_users_report, export_events_report, parse_lists_workbook,
+    ImportLimitError, IMPORT_MAX_FILE_SIZE
+)
 
 router = Router()
 
@@ -38,48 +40,16 @@ async def process_excel(message: Message, state: FSMContext, user: dict | None):
         await message.answer("Пожалуйста, отправьте файл .xlsx")
         return
 
-    file_id = doc.file_id
-    file = await message.bot.get_file(file_id)
-    file_path = file.file_path
-    
-    temp_filename = f"temp_{uuid.uuid4()}.xlsx"
-    await message.bot.download_file(file_path, temp_filename)
+    if doc.file_size and doc.file_size > IMPORT_MAX_FILE_SIZE:
+        await message.answer(
+            f"Файл слишком большой. Максимальный размер: {IMPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ"
+        )
+        return
 
     try:
-        wb = load_workbook(temp_filename)
-        
-        interests = []
-        regions = []
-        
-        interest_sheet_names = ["Interests", "Интересы", "interests", "интересы"]
-        region_sheet_names = ["Regions", "Регионы", "regions", "регионы"]
-        
-        interest_ws = None
-        for name in interest_sheet_names:
-            if name in wb.sheetnames:
-                interest_ws = wb[name]
-                break
-        
-        if interest_ws is None and len(wb.sheetnames) == 1:
-            ws = wb.active
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if row and len(row) >= 1 and row[0]:
-                    interests.append(str(row[0]).strip())
-                if row and len(row) >= 2 and row[1]:
-                    regions.append(str(row[1]).strip())
-        else:
-            if interest_ws:
-                for row in interest_ws.iter_rows(min_row=2, values_only=True):
-                    if row[0]:
-                        interests.append(str(row[0]).strip())
-            
-            for name in region_sheet_names:
-                if name in wb.sheetnames:
-                    region_ws = wb[name]
-                    for row in region_ws.iter_rows(min_row=2, values_only=True):
-                        if row[0]:
-                            regions.append(str(row[0]).strip())
-                    break
+        buffer = io.BytesIO()
+        await message.bot.download(doc, destination=buffer)
+        interests, regions = await asyncio.to_thread(parse_lists_workbook, buffer)
         
         async with get_session() as session:
             interest_repo = InterestRepository(session)
@@ -105,12 +75,11 @@ async def process_excel(message: Message, state: FSMContext, user: dict | None):
         
         await state.clear()
 
+    except ImportLimitError as e:
+        await message.answer(f"❌ {e}. Файл не загружен, списки не изменены.")
     except Exception as e:
         logging.error(f"Error processing Excel: {e}")
         await message.answer(f"Ошибка при обработке файла: {e}")
-    finally:
-        if os.path.exists(temp_filename):
-            os.remove(temp_filename)
 
 
 @router.message(F.text == "📊 Отчет по пользователям")
@@ -118,21 +87,28 @@ async def report_users(message: Message, user: dict | None):
     if user is None or user["role"] != "admin":
         return
 
-    filename = f"users_report_{uuid.uuid4()}.xlsx"
+    status = None
+
+    async def report_progress(done: int, total: int | None):
+        nonlocal status
+        text = f"⏳ Выгружено пользователей: {done} из {total}"
+        try:
+            if status is None:
+                status = await message.answer(text)
+            else:
+                await status.edit_text(text)
+        except Exception:
+            pass
     
     try:
-       
-        await export_users_report(filename)
+        report = await export_users_report(progress=report_progress)
         
-        input_file = types.FSInputFile(filename)
+        input_file = types.BufferedInputFile(report, filename="users_report.xlsx")
         await message.answer_document(input_file, caption="Отчет по пользователям")
         
     except Exception as e:
         logging.error(f"Error generating users report: {e}")
         await message.answer(f"Ошибка генерации отчета: {e}")
-    finally:
-        if os.path.exists(filename):
-            os.remove(filename)
 
 
 @router.message(F.text == "📅 Отчет по мероприятиям")
@@ -140,17 +116,12 @@ async def report_events(message: Message, user: dict | None):
     if user is None or user["role"] != "admin":
         return
 
-    filename = f"events_report_{uuid.uuid4()}.xlsx"
-    
     try:
-        await export_events_report(filename)
+        report = await export_events_report()
         
-        input_file = types.FSInputFile(filename)
+        input_file = types.BufferedInputFile(report, filename="events_report.xlsx")
         await message.answer_document(input_file, caption="Отчет по мероприятиям")
         
     except Exception as e:
         logging.error(f"Error generating events report: {e}")
         await message.answer(f"Ошибка генерации отчета: {e}")
-    finally:
-        if os.path.exists(filename):
-            os.remove(filename)
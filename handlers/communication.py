@@ -7,10 +7,12 @@ from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramBadRequest
 
 from database import get_session
-from database.repositories import (
-    UserRepository, FriendRepository, InterestRepository, RegionRepository
-)
-from keyboards.builders import get_user_main_menu, get_interests_keyboard, get_region_keyboard
+from database.cache import reference_data
+from database.repositories import UserRepository, FriendRepository
+from database.repositories.friend import FRIEND_STATUS, REQUEST_SENT_STATUS, REQUEST_RECEIVED_STATUS
+from keyboards.builders import get_user_main_menu, get_region_keyboard
+from keyboards.callbacks import InterestCallback
+from utils.interest_picker import start_interest_picker, handle_interest_callback, get_picked_interests
 
 
 class SearchStates(StatesGroup):
@@ -71,7 +73,7 @@ async def show_friends(message: Message, user: dict | None):
 
 
 @router.callback_query(lambda c: c.data.startswith("del_friend_ask_"))
-async def ask_delete_friend(callback: types.CallbackQuery, user: dict | None):
+async def ask_delete_friend(callback: types.CallbackQuery):
     friend_id = int(callback.data.split("_")[3])
     
     markup = InlineKeyboardMarkup(inline_keyboard=[
@@ -110,8 +112,7 @@ async def perform_delete_friend(callback: types.CallbackQuery, user: dict | None
         friend_name = "Пользователь"
         if friend_info:
             friend_name = f"{friend_info.name or ''} {friend_info.surname or ''}".strip() or "Пользователь"
-    
-    async with get_session() as session:
+        
         friend_repo = FriendRepository(session)
         await friend_repo.delete_friend(user['tg_id'], friend_id)
         
@@ -250,22 +251,50 @@ async def send_friend_message(message: Message, state: FSMContext, user: dict |
 
 
 
+REQUESTS_PAGE_SIZE = 10
+
+
 @router.message(F.text == "Входящие заявки")
 async def show_requests(message: Message, user: dict | None):
     if not user: 
         return
     
+    await send_requests_page(message, user)
+
+
+@router.callback_query(lambda c: c.data.startswith("requests_more_"))
+async def requests_more(callback: types.CallbackQuery, user: dict | None):
+    if not user:
+        await callback.answer()
+        return
+    
+    after_id = int(callback.data.split("_")[2])
+    await callback.message.edit_reply_markup(reply_markup=None)
+    await send_requests_page(callback.message, user, after_id)
+    await callback.answer()
+
+
+async def send_requests_page(message: Message, user: dict, after_id: int | None = None):
     async with get_session() as session:
         friend_repo = FriendRepository(session)
-        requests = await friend_repo.get_incoming_requests(user['tg_id'])
+        requests = await friend_repo.get_incoming_requests(
+            user['tg_id'], after_id=after_id, limit=REQUESTS_PAGE_SIZE + 1
+        )
 
     if not requests:
-        await message.answer("Входящих заявок нет.")
+        if after_id is None:
+            await message.answer("Входящих заявок нет.")
+        else:
+            await message.answer("Больше заявок нет.")
         return
 
-    await message.answer(f"Входящих заявок: {len(requests)}")
+    has_more = len(requests) > REQUESTS_PAGE_SIZE
+    page = requests[:REQUESTS_PAGE_SIZE]
+
+    if after_id is None:
+        await message.answer("Входящие заявки:")
     
-    for req in requests:
+    for req in page:
         name = req.get('name') or "Без имени"
         surname = req.get('surname') or ""
         age = req.get('age') or "?"
@@ -295,6 +324,14 @@ async def show_requests(message: Message, user: dict | None):
         
         await message.answer(caption, reply_markup=markup, parse_mode=ParseMode.HTML)
 
+    if has_more:
+        await message.answer(
+            "Есть ещё заявки",
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=[[
+                InlineKeyboardButton(text="⬇️ Показать ещё", callback_data=f"requests_more_{page[-1]['tg_id']}")
+            ]])
+        )
+
 
 
 @router.callback_query(lambda c: c.data.startswith("friend_accept_"))
@@ -304,32 +341,32 @@ async def accept_friend(callback: types.CallbackQuery, user: dict | None):
     async with get_session() as session:
         friend_repo = FriendRepository(session)
         result = await friend_repo.accept_request(user['tg_id'], friend_id)
+    
+    if result is not None:
+        await callback.message.edit_reply_markup(reply_markup=None)
+        await callback.answer("Заявка принята! ✅")
+        await callback.message.answer("Теперь вы друзья!")
         
-        if result is not None:
-            await callback.message.edit_reply_markup(reply_markup=None)
-            await callback.answer("Заявка принята! ✅")
-            await callback.message.answer("Теперь вы друзья!")
+        try:
+            my_name = f"{user.get('name','')} {user.get('surname','')}".strip()
+            await callback.bot.send_message(friend_id, f"👋 {my_name} принял(а) вашу заявку в друзья!")
             
-            try:
-                my_name = f"{user.get('name','')} {user.get('surname','')}".strip()
-                await callback.bot.send_message(friend_id, f"👋 {my_name} принял(а) вашу заявку в друзья!")
-                
-                if isinstance(result, int) and result > 0:
-                    try:
-                        await callback.bot.edit_message_reply_markup(
-                            chat_id=friend_id,
-                            message_id=result,
-                            reply_markup=None
-                        )
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-        else:
-            try:
-                await callback.answer("Ошибка при добавлении.")
-            except TelegramBadRequest:
-                pass  
+            if isinstance(result, int) and result > 0:
+                try:
+                    await callback.bot.edit_message_reply_markup(
+                        chat_id=friend_id,
+                        message_id=result,
+                        reply_markup=None
+                    )
+                except Exception:
+                    pass
+        except Exception:
+            pass
+    else:
+        try:
+            await callback.answer("Ошибка при добавлении.")
+        except TelegramBadRequest:
+            pass  
 
 
 @router.callback_query(lambda c: c.data.startswith("friend_decline_"))
@@ -375,14 +412,7 @@ async def search_by_interests(message: Message, state: FSMContext, user: dict |
     
     interests_list = user_interests.split(",") if isinstance(user_interests, str) else user_interests
     
-    async with get_session() as session:
-        user_repo = UserRepository(session)
-        results = await user_repo.search_users(
-            current_phone=user["number"],
-            interests=interests_list
-        )
-        
-    await show_search_results(message, results, user)
+    await perform_search(message, state, user, {"interests": interests_list})
 
 
 @router.message(F.text == "🔍 Расширенный поиск")
@@ -406,9 +436,7 @@ async def search_gender(message: Message, state: FSMContext):
     
     await state.update_data(gender=gender)
     
-    async with get_session() as session:
-        region_repo = RegionRepository(session)
-        regions_list = await region_repo.get_all_names()
+    regions_list = await reference_data.get_regions()
 
     kb = get_region_keyboard(regions_list)
     kb.keyboard.insert(0, [KeyboardButton(text="Любой")])
@@ -437,67 +465,93 @@ async def search_age(message: Message, state: FSMContext):
         
     await state.update_data(age_range=age_str)
     
-    async with get_session() as session:
-        interest_repo = InterestRepository(session)
-        interests_list = await interest_repo.get_all_names()
-        
     await message.answer(
         "Интересы (выберите или нажмите Готово):",
-        reply_markup=get_interests_keyboard(interests_list, [])
+        reply_markup=await start_interest_picker(state)
     )
     await state.set_state(SearchStates.waiting_interests)
 
 
+@router.callback_query(SearchStates.waiting_interests, InterestCallback.filter())
+async def search_interest_toggle(callback: types.CallbackQuery, callback_data: InterestCallback, state: FSMContext):
+    await handle_interest_callback(callback, callback_data, state)
+
+
 @router.callback_query(SearchStates.waiting_interests)
 async def search_interests(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
-    data = await state.get_data()
-    interests = data.get('interests', [])
-
-    if callback.data == "done":
-        await perform_search(callback.message, data, user, interests)
-        await state.clear()
+    if callback.data not in ("done", "skip_interests"):
         await callback.answer()
         return
-        
-    if callback.data in interests:
-        interests.remove(callback.data)
-    else:
-        interests.append(callback.data)
-        
-    await state.update_data(interests=interests)
-    
-    async with get_session() as session:
-        interest_repo = InterestRepository(session)
-        interests_list = await interest_repo.get_all_names()
     
-    await callback.message.edit_reply_markup(
-        reply_markup=get_interests_keyboard(interests_list, interests)
-    )
+    interests = await get_picked_interests(callback, state)
+    if interests is None:
+        return
+
+    data = await state.get_data()
+    await state.clear()
+    criteria = {
+        "gender": data.get("gender"),
+        "region": data.get("region"),
+        "age_range": data.get("age_range"),
+        "interests": interests
+    }
+    await perform_search(callback.message, state, user, criteria)
     await callback.answer()
 
 
-async def perform_search(message: Message, criteria: dict, user: dict, interests: list):
-    async with get_session() as session:
+SEARCH_PAGE_SIZE = 10
+
+
+async def perform_search(message: Message, state: FSMContext, user: dict, criteria: dict, offset: int = 0):
+    async with get_session(readonly=True) as session:
         user_repo = UserRepository(session)
         results = await user_repo.search_users(
             current_phone=user["number"],
             gender=criteria.get("gender"),
             region=criteria.get("region"),
             age_range=criteria.get("age_range"),
-            interests=interests
+            interests=criteria.get("interests"),
+            limit=SEARCH_PAGE_SIZE + 1,
+            offset=offset
         )
-        
-    await show_search_results(message, results, user)
+    
+    await state.update_data(search_criteria=criteria)
+    await show_search_results(message, results, user, offset)
 
 
-async def show_search_results(message: Message, results: list, user: dict):
+@router.callback_query(lambda c: c.data.startswith("search_more_"))
+async def search_more(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+    data = await state.get_data()
+    criteria = data.get("search_criteria")
+    if not user or criteria is None:
+        await callback.answer("Поиск устарел, начните заново.", show_alert=True)
+        return
+    
+    offset = int(callback.data.split("_")[2])
+    await callback.message.edit_reply_markup(reply_markup=None)
+    await perform_search(callback.message, state, user, criteria, offset)
+    await callback.answer()
+
+
+async def show_search_results(message: Message, results: list, user: dict, offset: int = 0):
     if not results:
-        await message.answer("Никого не найдено 😔", reply_markup=get_user_main_menu())
+        if offset == 0:
+            await message.answer("Никого не найдено 😔", reply_markup=get_user_main_menu())
+        else:
+            await message.answer("Больше никого не найдено.")
         return
-        
-    await message.answer(f"Найдено: {len(results)}\nПоказываем топ-10:", reply_markup=get_user_main_menu())
     
-    for res in results[:10]:
+    has_more = len(results) > SEARCH_PAGE_SIZE
+    page = results[:SEARCH_PAGE_SIZE]
+    
+    async with get_session() as session:
+        friend_repo = FriendRepository(session)
+        relations = await friend_repo.friend_set(user['tg_id'], [res['tg_id'] for res in page])
+    
+    if offset == 0:
+        await message.answer("Результаты поиска:", reply_markup=get_user_main_menu())
+    
+    for res in page:
         tg_id = res['tg_id']
         name = res['name']
         surname = res['surname'] or ""
@@ -513,14 +567,16 @@ async def show_search_results(message: Message, results: list, user: dict):
             f"❤️ Интересы: {user_interests}"
         )
         
-        async with get_session() as session:
-            friend_repo = FriendRepository(session)
-            is_friend = await friend_repo.is_friend(user['tg_id'], tg_id)
-            
-        if is_friend:
+        relation = relations.get(tg_id)
+        if relation == FRIEND_STATUS:
             kb = None
             caption += "\n\n✅ Уже в дузьях"
+        elif relation == REQUEST_SENT_STATUS:
+            kb = None
+            caption += "\n\n⏳ Заявка уже отправлена"
         else:
+            if relation == REQUEST_RECEIVED_STATUS:
+                caption += "\n\n📩 Хочет добавить вас в друзья"
             kb = InlineKeyboardMarkup(inline_keyboard=[[
                  InlineKeyboardButton(text="➕ Добавить в друзья", callback_data=f"add_friend_{tg_id}")
             ]])
@@ -532,6 +588,15 @@ async def show_search_results(message: Message, results: list, user: dict):
                 await message.answer(caption, reply_markup=kb, parse_mode=ParseMode.HTML)
         else:
             await message.answer(caption, reply_markup=kb, parse_mode=ParseMode.HTML)
+    
+    if has_more:
+        next_offset = offset + SEARCH_PAGE_SIZE
+        await message.answer(
+            f"Показано: {next_offset}",
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=[[
+                InlineKeyboardButton(text="⬇️ Показать ещё", callback_data=f"search_more_{next_offset}")
+            ]])
+        )
 
 
 @router.callback_query(lambda c: c.data.startswith("add_friend_"))
@@ -542,43 +607,45 @@ async def add_friend_request(callback: types.CallbackQuery, user: dict | None):
         friend_repo = FriendRepository(session)
         result = await friend_repo.send_request(user['tg_id'], target_id)
         
+        target_user = None
         if result == "ok":
-            await callback.answer("Заявка отправлена! 📨", show_alert=True)
+            user_repo = UserRepository(session)
+            target_user = await user_repo.get_by_tg_id(target_id)
+    
+    if result == "ok":
+        await callback.answer("Заявка отправлена! 📨", show_alert=True)
+        
+        target_name = "пользователю"
+        if target_user:
+            target_name = f"{target_user.name or ''} {target_user.surname or ''}".strip() or "пользователю"
+        
+        await callback.message.answer(
+            f"📤 Заявка в друзья отправлена {target_name}!\n"
+            f"Ожидайте ответа."
+        )
+        
+        try:
+            my_name = f"{user.get('name','')} {user.get('surname','')}".strip()
             
-            async with get_session() as session2:
-                user_repo = UserRepository(session2)
-                target_user = await user_repo.get_by_tg_id(target_id)
-                target_name = "пользователю"
-                if target_user:
-                    target_name = f"{target_user.name or ''} {target_user.surname or ''}".strip() or "пользователю"
+            markup = InlineKeyboardMarkup(inline_keyboard=[
+                [
+                    InlineKeyboardButton(text="✅ Принять", callback_data=f"friend_accept_{user['tg_id']}"),
+                    InlineKeyboardButton(text="❌ Отклонить", callback_data=f"friend_decline_{user['tg_id']}")
+                ]
+            ])
             
-            await callback.message.answer(
-                f"📤 Заявка в друзья отправлена {target_name}!\n"
-                f"Ожидайте ответа."
+            await callback.bot.send_message(
+                target_id, 
+                f"📥 Вам пришла заявка в друзья от <b>{my_name}</b>!\n\n"
+                f"Вы можете принять или отклонить её.",
+                reply_markup=markup,
+                parse_mode=ParseMode.HTML
             )
-            
-            try:
-                my_name = f"{user.get('name','')} {user.get('surname','')}".strip()
-                
-                markup = InlineKeyboardMarkup(inline_keyboard=[
-                    [
-                        InlineKeyboardButton(text="✅ Принять", callback_data=f"friend_accept_{user['tg_id']}"),
-                        InlineKeyboardButton(text="❌ Отклонить", callback_data=f"friend_decline_{user['tg_id']}")
-                    ]
-                ])
-                
-                await callback.bot.send_message(
-                    target_id, 
-                    f"📥 Вам пришла заявка в друзья от <b>{my_name}</b>!\n\n"
-                    f"Вы можете принять или отклонить её.",
-                    reply_markup=markup,
-                    parse_mode=ParseMode.HTML
-                )
-            except:
-                pass
-        elif result == "already_friends":
-            await callback.answer("Вы уже друзья!", show_alert=True)
-        elif result == "already_sent":
-            await callback.answer("Заявка уже была отправлена.", show_alert=True)
-        else:
-            await callback.answer("Ошибка при отправке.", show_alert=True)
+        except:
+            pass
+    elif result == "already_friends":
+        await callback.answer("Вы уже друзья!", show_alert=True)
+    elif result == "already_sent":
+        await callback.answer("Заявка уже была отправлена.", show_alert=True)
+    else:
+        await callback.answer("Ошибка при отправке.", show_alert=True)
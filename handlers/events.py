@@ -3,26 +3,32 @@ import asyncio
 import re
 import uuid
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from aiogram import Router, F, types
 from aiogram.types import Message, ReplyKeyboardRemove
+from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramBadRequest
 
-from states.states import CreateEvent
+from states.states import CreateEvent, InviteFriends
 from keyboards.builders import (
-    get_interests_keyboard, get_description_keyboard, get_photo_keyboard,
+    get_description_keyboard, get_photo_keyboard,
     get_user_main_menu, get_events_menu_keyboard, get_event_card_keyboard_optimized,
     get_my_event_card_keyboard, get_event_creation_keyboard, get_friends_select_keyboard,
-    get_participants_manage_keyboard
+    get_participants_manage_keyboard, filter_friends
 )
+from keyboards.callbacks import FriendPickCallback, InterestCallback
+from utils import bitset
+from utils.interest_picker import start_interest_picker, handle_interest_callback, get_picked_interests
 from utils.validation import escape_html, is_valid_date, is_valid_time
 
 from database import get_session
 from database.repositories import (
     EventRepository, ParticipantRepository, InviteRepository, 
-    UserRepository, InterestRepository, FriendRepository
+    UserRepository, FriendRepository
 )
+from database.repositories.event import event_starts_at
 
 router = Router()
 
@@ -31,7 +37,7 @@ def mask_phone(phone: str) -> str:
         return "***"
     return f"***{phone[-4:]}"
 
-async def get_event_card_text(event: dict, session=None):
+def get_event_card_text(event: dict) -> str:
     safe_name = escape_html(event.get('name', ''))
     safe_date = escape_html(event.get('date', ''))
     safe_time = escape_html(event.get('time', ''))
@@ -42,12 +48,10 @@ async def get_event_card_text(event: dict, session=None):
     organizer_phone = event.get('organizer_phone')
     masked_organizer = mask_phone(organizer_phone)
     
-    organizer_name = masked_organizer
-    if session:
-        user_repo = UserRepository(session)
-        organizer = await user_repo.get_by_phone(organizer_phone)
-        if organizer:
-            organizer_name = f"{organizer.name or ''} {organizer.surname or ''}".strip() or masked_organizer
+    organizer_name = (
+        f"{event.get('organizer_name') or ''} {event.get('organizer_surname') or ''}".strip()
+        or masked_organizer
+    )
     
     safe_organizer = escape_html(organizer_name)
 
@@ -100,6 +104,10 @@ async def event_date(message: Message, state: FSMContext):
     if not is_valid_date(message.text):
         await message.answer("🚫 Неверный формат даты. Используйте ДД.ММ.ГГГГ (например, 25.12.2025)")
         return
+    # Feeds only list upcoming events, so a past event would be created invisible
+    if event_starts_at(message.text, "23:59") <= datetime.now(timezone.utc):
+        await message.answer("🚫 Эта дата уже прошла. Укажите сегодняшнюю или будущую дату.")
+        return
     await state.update_data(date=message.text)
     await message.answer("Введите время (ЧЧ:ММ):", reply_markup=get_event_creation_keyboard())
     await state.set_state(CreateEvent.time)
@@ -110,25 +118,31 @@ async def event_time(message: Message, state: FSMContext):
     if not is_valid_time(message.text):
         await message.answer("🚫 Неверный формат времени. Используйте ЧЧ:ММ (например, 18:30)")
         return
+    data = await state.get_data()
+    starts_at = event_starts_at(data.get("date"), message.text)
+    if starts_at is not None and starts_at <= datetime.now(timezone.utc):
+        await message.answer("🚫 Это время уже прошло. Укажите время в будущем.")
+        return
     await state.update_data(time=message.text)
     
-    async with get_session() as session:
-        interest_repo = InterestRepository(session)
-        interests_list = await interest_repo.get_all_names()
-    
     await message.answer(
         "Выберите интересы (теги) мероприятия:",
-        reply_markup=get_interests_keyboard(interests_list, [])
+        reply_markup=await start_interest_picker(state)
     )
     await state.set_state(CreateEvent.interests)
 
 
+@router.callback_query(CreateEvent.interests, InterestCallback.filter())
+async def event_interest_toggle(callback: types.CallbackQuery, callback_data: InterestCallback, state: FSMContext):
+    await handle_interest_callback(callback, callback_data, state)
+
+
 @router.callback_query(CreateEvent.interests)
 async def event_interests_callback(callback: types.CallbackQuery, state: FSMContext):
-    data = await state.get_data()
-    interests = data.get('interests', [])
-
     if callback.data == "done":
+        interests = await get_picked_interests(callback, state)
+        if interests is None:
+            return
         if not interests:
             await callback.answer("🚫 Укажите хотя бы один интерес.")
             return
@@ -141,24 +155,6 @@ async def event_interests_callback(callback: types.CallbackQuery, state: FSMCont
         await callback.answer()
         return
 
-    if callback.data == "keep_current": 
-        await callback.answer()
-        return
-
-    if callback.data in interests:
-        interests.remove(callback.data)
-    else:
-        interests.append(callback.data)
-
-    await state.update_data(interests=interests)
-    
-    async with get_session() as session:
-        interest_repo = InterestRepository(session)
-        interests_list = await interest_repo.get_all_names()
-        
-    await callback.message.edit_reply_markup(
-        reply_markup=get_interests_keyboard(interests_list, interests)
-    )
     await callback.answer()
 
 
@@ -307,12 +303,10 @@ async def event_invite_friends(message: Message, state: FSMContext, user: dict |
             await _create_event_without_invites(message, state, user, data)
             return
         
-        await state.update_data(selected_friends=[])
         await state.set_state(CreateEvent.select_friends)
-        
-        await message.answer(
-            "Выберите друзей для приглашения:\n(нажмите на друга чтобы выбрать/отменить)",
-            reply_markup=get_friends_select_keyboard(friends, [])
+        await _open_friends_picker(
+            message, state, friends,
+            "Выберите друзей для приглашения:\n(нажмите на друга чтобы выбрать/отменить)"
         )
     else:
         await _create_event_without_invites(message, state, user, data)
@@ -335,82 +329,165 @@ async def _create_event_without_invites(message: Message, state: FSMContext, use
     await state.clear()
 
 
-@router.callback_query(CreateEvent.select_friends)
-async def select_friends_callback(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+def _friends_snapshot(friends: list) -> list:
+    snapshot = [
+        [f['tg_id'], f"{f.get('name') or ''} {f.get('surname') or ''}".strip() or "Пользователь"]
+        for f in friends if f.get('tg_id')
+    ]
+    snapshot.sort(key=lambda friend: friend[1].casefold())
+    return snapshot
+
+
+def _picker_keyboard(data: dict):
+    return get_friends_select_keyboard(
+        data['picker_friends'], data.get('picker_mask', 0),
+        data.get('picker_page', 0), data.get('picker_query', "")
+    )
+
+
+def _picked_tg_ids(data: dict) -> list:
+    friends = data['picker_friends']
+    return [friends[index][0] for index in bitset.iter_ids(data.get('picker_mask', 0))]
+
+
+async def _open_friends_picker(message: Message, state: FSMContext, friends: list, text: str):
+    # The friend list is snapshotted once per picker so toggles and paging never hit the DB
+    await state.update_data(
+        picker_friends=_friends_snapshot(friends),
+        picker_mask=0,
+        picker_page=0,
+        picker_query="",
+        picker_text=text
+    )
+    data = await state.get_data()
+    sent = await message.answer(text, reply_markup=_picker_keyboard(data))
+    await state.update_data(picker_message_id=sent.message_id)
+
+
+async def _update_friends_picker(
+    callback: types.CallbackQuery, callback_data: FriendPickCallback,
+    state: FSMContext, select_state, search_state
+) -> bool:
     data = await state.get_data()
-    selected = data.get('selected_friends', [])
+    action = callback_data.action
     
-    if callback.data == "cancel_invites":
-        await _create_event_without_invites(callback.message, state, user, data)
+    if action == "noop":
         await callback.answer()
+        return True
+    
+    # Any other button while a search prompt is pending abandons the search
+    if action != "search" and await state.get_state() == search_state.state:
+        await state.set_state(select_state)
+    
+    if action == "search":
+        await state.set_state(search_state)
+        await callback.message.answer("Введите имя или фамилию друга:")
+        await callback.answer()
+        return True
+    
+    if action == "toggle":
+        if callback_data.value >= len(data['picker_friends']):
+            await callback.answer()
+            return True
+        data['picker_mask'] = bitset.toggle(data.get('picker_mask', 0), callback_data.value)
+        await state.update_data(picker_mask=data['picker_mask'])
+        answer = None
+    elif action == "page":
+        data['picker_page'] = callback_data.value
+        await state.update_data(picker_page=callback_data.value)
+        answer = None
+    elif action == "all":
+        matches = filter_friends(data['picker_friends'], data.get('picker_query', ""))
+        data['picker_mask'] = data.get('picker_mask', 0) | bitset.from_ids(matches)
+        await state.update_data(picker_mask=data['picker_mask'])
+        answer = "Все найденные друзья выбраны" if data.get('picker_query') else "Все друзья выбраны"
+    elif action == "reset_search":
+        data['picker_query'] = ""
+        data['picker_page'] = 0
+        await state.update_data(picker_query="", picker_page=0)
+        answer = None
+    else:
+        return False
+    
+    try:
+        await callback.message.edit_reply_markup(reply_markup=_picker_keyboard(data))
+    except TelegramBadRequest:
+        pass
+    await callback.answer(answer)
+    return True
+
+
+@router.message(StateFilter(CreateEvent.search_friends, InviteFriends.search), F.text)
+async def friends_picker_search(message: Message, state: FSMContext):
+    query = message.text.strip().casefold()
+    data = await state.get_data()
+    
+    if await state.get_state() == CreateEvent.search_friends.state:
+        await state.set_state(CreateEvent.select_friends)
+    else:
+        await state.set_state(InviteFriends.select)
+    
+    data['picker_query'] = query
+    data['picker_page'] = 0
+    
+    old_message_id = data.get('picker_message_id')
+    if old_message_id:
+        try:
+            await message.bot.delete_message(message.chat.id, old_message_id)
+        except TelegramBadRequest:
+            pass
+    
+    found = len(filter_friends(data['picker_friends'], query))
+    text = data['picker_text'] if found else f"{data['picker_text']}\n\nНикого не найдено по запросу «{message.text.strip()}»."
+    sent = await message.answer(text, reply_markup=_picker_keyboard(data))
+    await state.update_data(picker_query=query, picker_page=0, picker_message_id=sent.message_id)
+
+
+@router.callback_query(StateFilter(CreateEvent.select_friends, CreateEvent.search_friends), FriendPickCallback.filter())
+async def select_friends_callback(
+    callback: types.CallbackQuery, callback_data: FriendPickCallback,
+    state: FSMContext, user: dict | None
+):
+    if await _update_friends_picker(
+        callback, callback_data, state, CreateEvent.select_friends, CreateEvent.search_friends
+    ):
         return
     
-    if callback.data == "sel_all_friends":
-        async with get_session() as session:
-            friend_repo = FriendRepository(session)
-            friends = await friend_repo.get_friends(user['tg_id'])
-        selected = [f['tg_id'] for f in friends if f.get('tg_id')]
-        await state.update_data(selected_friends=selected)
-        await callback.message.edit_reply_markup(
-            reply_markup=get_friends_select_keyboard(friends, selected)
-        )
-        await callback.answer("Все друзья выбраны")
+    data = await state.get_data()
+    
+    if callback_data.action == "cancel":
+        await _create_event_without_invites(callback.message, state, user, data)
+        await callback.answer()
         return
     
-    if callback.data == "send_invites":
+    if callback_data.action == "send":
+        selected = _picked_tg_ids(data)
         if not selected:
             await callback.answer("Выберите хотя бы одного друга!", show_alert=True)
             return
         
         await _create_event_with_invites(callback, state, user, data, selected)
-        return
-    
-    if callback.data.startswith("sel_friend_"):
-        friend_tg_id = int(callback.data.split("_")[2])
-        
-        if friend_tg_id in selected:
-            selected.remove(friend_tg_id)
-        else:
-            selected.append(friend_tg_id)
-        
-        await state.update_data(selected_friends=selected)
-        
-        async with get_session() as session:
-            friend_repo = FriendRepository(session)
-            friends = await friend_repo.get_friends(user['tg_id'])
-        
-        await callback.message.edit_reply_markup(
-            reply_markup=get_friends_select_keyboard(friends, selected)
-        )
-        await callback.answer()
 
 
 async def _create_event_with_invites(
     callback: types.CallbackQuery, state: FSMContext, 
     user: dict, data: dict, selected_tg_ids: list
 ):
-    notifications_to_send = []
-    invited_count = 0
-    
+    # The block commits on exit, so invitees are only notified about an event that exists
     async with get_session() as session:
         event_repo = EventRepository(session)
         event_id = await event_repo.create(user["number"], data)
         
-        if not event_id:
-            await callback.message.answer("Ошибка при создании мероприятия.", reply_markup=get_events_menu_keyboard())
-            await state.clear()
-            await callback.answer()
-            return
-        
-        user_repo = UserRepository(session)
-        invite_repo = InviteRepository(session)
-        
-        for tg_id in selected_tg_ids:
-            friend_user = await user_repo.get_by_tg_id(tg_id)
-            if friend_user and friend_user.number:
-                if await invite_repo.create_invite(event_id, friend_user.number):
-                    invited_count += 1
-                    notifications_to_send.append(tg_id)
+        notifications_to_send = []
+        if event_id:
+            invite_repo = InviteRepository(session)
+            notifications_to_send = await invite_repo.create_invites(event_id, selected_tg_ids)
+    
+    if not event_id:
+        await callback.message.answer("Ошибка при создании мероприятия.", reply_markup=get_events_menu_keyboard())
+        await state.clear()
+        await callback.answer()
+        return
     
     if notifications_to_send:
         my_name = f"{user.get('name', '')} {user.get('surname', '')}".strip()
@@ -432,7 +509,7 @@ async def _create_event_with_invites(
     
     await callback.message.edit_text(
         f"Мероприятие «{data['name']}» создано! 🎉\n"
-        f"Приглашено друзей: {invited_count}"
+        f"Приглашено друзей: {len(notifications_to_send)}"
     )
     await callback.message.answer("Выберите действие:", reply_markup=get_events_menu_keyboard())
     await state.clear()
@@ -445,7 +522,7 @@ async def view_friends_events(message: Message, user: dict | None):
     if not user: 
         return
     
-    async with get_session() as session:
+    async with get_session(readonly=True) as session:
         event_repo = EventRepository(session)
         events = await event_repo.get_friends_events(user["number"])
     
@@ -455,7 +532,8 @@ async def view_friends_events(message: Message, user: dict | None):
 
     for event_row in events:
         try:
-            (eid, name, date, time, addr, interests, desc, org_phone, lat, lon, is_part) = event_row
+            (eid, name, date, time, addr, interests, desc, org_phone, lat, lon,
+             org_name, org_surname, is_part) = event_row
             
             event_dict = {
                 "name": name,
@@ -464,11 +542,12 @@ async def view_friends_events(message: Message, user: dict | None):
                 "address": addr,
                 "description": desc,
                 "interests": interests,
-                "organizer_phone": org_phone
+                "organizer_phone": org_phone,
+                "organizer_name": org_name,
+                "organizer_surname": org_surname
             }
             
-            async with get_session() as session:
-                caption = await get_event_card_text(event_dict, session)
+            caption = get_event_card_text(event_dict)
             
             kb = get_event_card_keyboard_optimized(
                 event_id=eid,
@@ -495,32 +574,31 @@ async def view_my_events(message: Message, user: dict | None):
         await message.answer("Вы пока не создали и не участвуете ни в одном мероприятии.", reply_markup=get_events_menu_keyboard())
         return
 
-    async with get_session() as session:
-        if organized:
-            await message.answer("<b>Вы организатор:</b>", parse_mode=ParseMode.HTML)
-            for e_row in organized:
-                eid = e_row[0]
-                event_dict = {
-                    "name": e_row[1], "date": e_row[2], "time": e_row[3],
-                    "address": e_row[4], "interests": e_row[5], "description": e_row[6],
-                    "organizer_phone": e_row[7]
-                }
-                caption = await get_event_card_text(event_dict, session)
-                kb = get_my_event_card_keyboard(eid, is_organizer=True)
-                await message.answer(caption, reply_markup=kb, parse_mode=ParseMode.HTML)
-
-        if participated:
-            await message.answer("<b>Вы участвуете:</b>", parse_mode=ParseMode.HTML)
-            for e_row in participated:
-                eid = e_row[0]
-                event_dict = {
-                    "name": e_row[1], "date": e_row[2], "time": e_row[3],
-                    "address": e_row[4], "interests": e_row[5], "description": e_row[6],
-                    "organizer_phone": e_row[7]
-                }
-                caption = await get_event_card_text(event_dict, session)
-                kb = get_my_event_card_keyboard(eid, is_organizer=False)
-                await message.answer(caption, reply_markup=kb, parse_mode=ParseMode.HTML)
+    if organized:
+        await message.answer("<b>Вы организатор:</b>", parse_mode=ParseMode.HTML)
+        for e_row in organized:
+            eid = e_row[0]
+            event_dict = {
+                "name": e_row[1], "date": e_row[2], "time": e_row[3],
+                "address": e_row[4], "interests": e_row[5], "description": e_row[6],
+                "organizer_phone": e_row[7], "organizer_name": e_row[10], "organizer_surname": e_row[11]
+            }
+            caption = get_event_card_text(event_dict)
+            kb = get_my_event_card_keyboard(eid, is_organizer=True)
+            await message.answer(caption, reply_markup=kb, parse_mode=ParseMode.HTML)
+
+    if participated:
+        await message.answer("<b>Вы участвуете:</b>", parse_mode=ParseMode.HTML)
+        for e_row in participated:
+            eid = e_row[0]
+            event_dict = {
+                "name": e_row[1], "date": e_row[2], "time": e_row[3],
+                "address": e_row[4], "interests": e_row[5], "description": e_row[6],
+                "organizer_phone": e_row[7], "organizer_name": e_row[10], "organizer_surname": e_row[11]
+            }
+            caption = get_event_card_text(event_dict)
+            kb = get_my_event_card_keyboard(eid, is_organizer=False)
+            await message.answer(caption, reply_markup=kb, parse_mode=ParseMode.HTML)
 
 
 
@@ -532,20 +610,23 @@ async def join_event_handler(callback: types.CallbackQuery, user: dict | None):
         part_repo = ParticipantRepository(session)
         success, msg = await part_repo.join_event(event_id, user["number"])
         
+        event = None
         if success:
-            await callback.answer("Вы успешно записались!", show_alert=True)
             event_repo = EventRepository(session)
             event = await event_repo.get_by_id(event_id)
-            if event:
-                kb = get_event_card_keyboard_optimized(
-                    event_id, user["number"], event["organizer_phone"], is_participant=True
-                )
-                await callback.message.edit_reply_markup(reply_markup=kb)
+    
+    if success:
+        await callback.answer("Вы успешно записались!", show_alert=True)
+        if event:
+            kb = get_event_card_keyboard_optimized(
+                event_id, user["number"], event["organizer_phone"], is_participant=True
+            )
+            await callback.message.edit_reply_markup(reply_markup=kb)
+    else:
+        if msg == "already_joined":
+            await callback.answer("Вы уже участвуете.", show_alert=True)
         else:
-            if msg == "already_joined":
-                await callback.answer("Вы уже участвуете.", show_alert=True)
-            else:
-                await callback.answer("Ошибка при записи.", show_alert=True)
+            await callback.answer("Ошибка при записи.", show_alert=True)
 
 
 @router.callback_query(F.data.startswith("leave_event_"))
@@ -556,34 +637,40 @@ async def leave_event_handler(callback: types.CallbackQuery, user: dict | None):
         part_repo = ParticipantRepository(session)
         success, msg, organizer_phone = await part_repo.leave_event(event_id, user["number"])
         
+        organizer_tg_id = None
+        event = None
         if success:
-            await callback.answer("Вы отказались от участия.", show_alert=True)
-            
             if organizer_phone:
                 user_repo = UserRepository(session)
                 organizer = await user_repo.get_by_phone(organizer_phone)
-                
-                if organizer and organizer.tg_id:
-                    try:
-                        participant_name = f"{user.get('name', '')} {user.get('surname', '')}".strip()
-                        await callback.bot.send_message(
-                            organizer.tg_id,
-                            f"⚠️ Пользователь {participant_name} отказался от участия в вашем мероприятии."
-                        )
-                    except Exception as e:
-                        logging.error(f"Failed to notify organizer: {e}")
+                if organizer:
+                    organizer_tg_id = organizer.tg_id
             
             event_repo = EventRepository(session)
             event = await event_repo.get_by_id(event_id)
-            if event:
-                kb = get_event_card_keyboard_optimized(
-                    event_id, user["number"], event["organizer_phone"], is_participant=False
+    
+    if success:
+        await callback.answer("Вы отказались от участия.", show_alert=True)
+        
+        if organizer_tg_id:
+            try:
+                participant_name = f"{user.get('name', '')} {user.get('surname', '')}".strip()
+                await callback.bot.send_message(
+                    organizer_tg_id,
+                    f"⚠️ Пользователь {participant_name} отказался от участия в вашем мероприятии."
                 )
-                await callback.message.edit_reply_markup(reply_markup=kb)
-            else:
-                await callback.message.delete()
+            except Exception as e:
+                logging.error(f"Failed to notify organizer: {e}")
+        
+        if event:
+            kb = get_event_card_keyboard_optimized(
+                event_id, user["number"], event["organizer_phone"], is_participant=False
+            )
+            await callback.message.edit_reply_markup(reply_markup=kb)
         else:
-            await callback.answer("Ошибка при выходе.", show_alert=True)
+            await callback.message.delete()
+    else:
+        await callback.answer("Ошибка при выходе.", show_alert=True)
 
 
 @router.callback_query(F.data.startswith("view_map_"))
@@ -677,51 +764,56 @@ async def remove_participant_handler(callback: types.CallbackQuery, user: dict |
         event_repo = EventRepository(session)
         event = await event_repo.get_by_id(event_id)
         
-        if not event or event.get('organizer_phone') != user.get('number'):
-            await callback.answer("Только организатор может удалять участников.", show_alert=True)
-            return
-        
-        part_repo = ParticipantRepository(session)
-        participants = await part_repo.get_participants_with_details(event_id)
-        
+        is_organizer = event is not None and event.get('organizer_phone') == user.get('number')
         target_participant = None
-        for p in participants:
-            phone, name, surname, tg_id = p
-            if phone and phone.endswith(phone_suffix):
-                target_participant = p
-                break
-        
-        if not target_participant:
-            await callback.answer("Участник не найден.", show_alert=True)
-            return
-        
-        phone, name, surname, tg_id = target_participant
-        success, removed_tg_id = await part_repo.remove_participant(event_id, phone)
-        
-        if success:
-            display_name = f"{name or ''} {surname or ''}".strip() or "Пользователь"
+        success = False
+        if is_organizer:
+            part_repo = ParticipantRepository(session)
+            participants = await part_repo.get_participants_with_details(event_id)
             
-            if removed_tg_id:
-                organizer_name = f"{user.get('name', '')} {user.get('surname', '')}".strip()
-                try:
-                    await callback.bot.send_message(
-                        removed_tg_id,
-                        f"😔 Организатор ({organizer_name}) удалил вас из мероприятия «{event['name']}»."
-                    )
-                except Exception as e:
-                    logging.error(f"Failed to notify removed participant: {e}")
-            
-            await callback.answer(f"Участник {display_name} удалён.", show_alert=True)
+            for p in participants:
+                phone, name, surname, tg_id = p
+                if phone and phone.endswith(phone_suffix):
+                    target_participant = p
+                    break
             
-            updated_participants = await part_repo.get_participants_with_details(event_id)
-            if updated_participants:
-                await callback.message.edit_reply_markup(
-                    reply_markup=get_participants_manage_keyboard(event_id, updated_participants)
+            if target_participant:
+                success, removed_tg_id = await part_repo.remove_participant(event_id, target_participant[0])
+                if success:
+                    updated_participants = await part_repo.get_participants_with_details(event_id)
+    
+    if not is_organizer:
+        await callback.answer("Только организатор может удалять участников.", show_alert=True)
+        return
+    
+    if not target_participant:
+        await callback.answer("Участник не найден.", show_alert=True)
+        return
+    
+    if success:
+        phone, name, surname, tg_id = target_participant
+        display_name = f"{name or ''} {surname or ''}".strip() or "Пользователь"
+        
+        if removed_tg_id:
+            organizer_name = f"{user.get('name', '')} {user.get('surname', '')}".strip()
+            try:
+                await callback.bot.send_message(
+                    removed_tg_id,
+                    f"😔 Организатор ({organizer_name}) удалил вас из мероприятия «{event['name']}»."
                 )
-            else:
-                await callback.message.edit_text("👥 Все участники удалены.")
+            except Exception as e:
+                logging.error(f"Failed to notify removed participant: {e}")
+        
+        await callback.answer(f"Участник {display_name} удалён.", show_alert=True)
+        
+        if updated_participants:
+            await callback.message.edit_reply_markup(
+                reply_markup=get_participants_manage_keyboard(event_id, updated_participants)
+            )
         else:
-            await callback.answer("Ошибка при удалении.", show_alert=True)
+            await callback.message.edit_text("👥 Все участники удалены.")
+    else:
+        await callback.answer("Ошибка при удалении.", show_alert=True)
 
 
 @router.callback_query(F.data.startswith("back_participants_"))
@@ -749,102 +841,68 @@ async def invite_users_to_event(callback: types.CallbackQuery, state: FSMContext
         await callback.answer("У вас пока нет друзей для приглашения.", show_alert=True)
         return
     
+    await state.set_state(InviteFriends.select)
     await state.update_data(
         invite_event_id=event_id,
-        invite_event_name=event['name'],
-        selected_invite_friends=[]
+        invite_event_name=event['name']
     )
-    
-    await callback.message.answer(
-        f"Выберите друзей для приглашения на «{event['name']}»:",
-        reply_markup=get_friends_select_keyboard(friends, [])
+    await _open_friends_picker(
+        callback.message, state, friends,
+        f"Выберите друзей для приглашения на «{event['name']}»:"
     )
     await callback.answer()
 
 
-@router.callback_query(lambda c: c.data in ["sel_all_friends", "send_invites", "cancel_invites"] or c.data.startswith("sel_friend_"))
-async def handle_invite_selection(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
-    data = await state.get_data()
-    
-    if 'invite_event_id' not in data:
-        return  
+@router.callback_query(StateFilter(InviteFriends.select, InviteFriends.search), FriendPickCallback.filter())
+async def handle_invite_selection(
+    callback: types.CallbackQuery, callback_data: FriendPickCallback,
+    state: FSMContext, user: dict | None
+):
+    if await _update_friends_picker(
+        callback, callback_data, state, InviteFriends.select, InviteFriends.search
+    ):
+        return
     
+    data = await state.get_data()
     event_id = data['invite_event_id']
     event_name = data['invite_event_name']
-    selected = data.get('selected_invite_friends', [])
     
-    if callback.data == "cancel_invites":
+    if callback_data.action == "cancel":
         await state.clear()
         await callback.message.delete()
         await callback.answer("Приглашение отменено")
         return
     
-    if callback.data == "sel_all_friends":
-        async with get_session() as session:
-            friend_repo = FriendRepository(session)
-            friends = await friend_repo.get_friends(user['tg_id'])
-        selected = [f['tg_id'] for f in friends if f.get('tg_id')]
-        await state.update_data(selected_invite_friends=selected)
-        await callback.message.edit_reply_markup(
-            reply_markup=get_friends_select_keyboard(friends, selected)
-        )
-        await callback.answer("Все друзья выбраны")
-        return
-    
-    if callback.data == "send_invites":
+    if callback_data.action == "send":
+        selected = _picked_tg_ids(data)
         if not selected:
             await callback.answer("Выберите хотя бы одного друга!", show_alert=True)
             return
         
-        invited_count = 0
         my_name = f"{user.get('name', '')} {user.get('surname', '')}".strip()
         
         async with get_session() as session:
-            user_repo = UserRepository(session)
             invite_repo = InviteRepository(session)
-            
-            markup = types.InlineKeyboardMarkup(inline_keyboard=[
-                [types.InlineKeyboardButton(text="✅ Принять", callback_data=f"invite_accept_{event_id}")],
-                [types.InlineKeyboardButton(text="❌ Отклонить", callback_data=f"invite_decline_{event_id}")]
-            ])
-            
-            for tg_id in selected:
-                friend_user = await user_repo.get_by_tg_id(tg_id)
-                if friend_user and friend_user.number:
-                    if await invite_repo.create_invite(event_id, friend_user.number):
-                        invited_count += 1
-                        try:
-                            await callback.bot.send_message(
-                                tg_id,
-                                f"📩 <b>{my_name}</b> приглашает вас на мероприятие «{event_name}»!",
-                                reply_markup=markup,
-                                parse_mode=ParseMode.HTML
-                            )
-                        except:
-                            pass
+            invited_tg_ids = await invite_repo.create_invites(event_id, selected)
         
-        await state.clear()
-        await callback.message.edit_text(f"✅ Приглашения отправлены: {invited_count}")
-        await callback.answer()
-        return
-    
-    if callback.data.startswith("sel_friend_"):
-        friend_tg_id = int(callback.data.split("_")[2])
-        
-        if friend_tg_id in selected:
-            selected.remove(friend_tg_id)
-        else:
-            selected.append(friend_tg_id)
-        
-        await state.update_data(selected_invite_friends=selected)
+        markup = types.InlineKeyboardMarkup(inline_keyboard=[
+            [types.InlineKeyboardButton(text="✅ Принять", callback_data=f"invite_accept_{event_id}")],
+            [types.InlineKeyboardButton(text="❌ Отклонить", callback_data=f"invite_decline_{event_id}")]
+        ])
         
-        async with get_session() as session:
-            friend_repo = FriendRepository(session)
-            friends = await friend_repo.get_friends(user['tg_id'])
+        for tg_id in invited_tg_ids:
+            try:
+                await callback.bot.send_message(
+                    tg_id,
+                    f"📩 <b>{my_name}</b> приглашает вас на мероприятие «{event_name}»!",
+                    reply_markup=markup,
+                    parse_mode=ParseMode.HTML
+                )
+            except:
+                pass
         
-        await callback.message.edit_reply_markup(
-            reply_markup=get_friends_select_keyboard(friends, selected)
-        )
+        await state.clear()
+        await callback.message.edit_text(f"✅ Приглашения отправлены: {len(invited_tg_ids)}")
         await callback.answer()
 
 
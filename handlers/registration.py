@@ -8,13 +8,16 @@ from aiogram.exceptions import TelegramBadRequest
 from states.states import Registration
 from keyboards.builders import (
     get_skip_edit_keyboard, get_gender_keyboard, get_region_keyboard,
-    get_interests_keyboard, get_photo_keyboard, get_location_keyboard,
+    get_photo_keyboard, get_location_keyboard,
     get_user_main_menu, get_contact_keyboard, get_edit_profile_menu,
     get_admin_menu_keyboard
 )
+from keyboards.callbacks import InterestCallback
+from utils.interest_picker import start_interest_picker, handle_interest_callback, get_picked_interests
 from utils.validation import is_valid_name, is_valid_age, normalize_phone
 from database import get_session
-from database.repositories import UserRepository, RegionRepository, InterestRepository
+from database.cache import reference_data
+from database.repositories import UserRepository
 
 router = Router()
 
@@ -101,7 +104,7 @@ async def process_contact(message: Message, state: FSMContext, user: dict | None
 
 
 @router.message(Registration.name)
-async def reg_name(message: Message, state: FSMContext, user: dict | None):
+async def reg_name(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -153,7 +156,7 @@ async def reg_name(message: Message, state: FSMContext, user: dict | None):
 
 
 @router.message(Registration.surname)
-async def reg_surname(message: Message, state: FSMContext, user: dict | None):
+async def reg_surname(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -195,7 +198,7 @@ async def reg_surname(message: Message, state: FSMContext, user: dict | None):
     await state.set_state(Registration.gender)
 
 @router.message(Registration.gender)
-async def reg_gender(message: Message, state: FSMContext, user: dict | None):
+async def reg_gender(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -234,7 +237,7 @@ async def reg_gender(message: Message, state: FSMContext, user: dict | None):
     await state.set_state(Registration.age)
 
 @router.message(Registration.age)
-async def reg_age(message: Message, state: FSMContext, user: dict | None):
+async def reg_age(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -269,15 +272,13 @@ async def reg_age(message: Message, state: FSMContext, user: dict | None):
         current = data.get("region", "не указан")
         await message.answer(f"Текущий регион: {current}")
 
-    async with get_session() as session:
-        region_repo = RegionRepository(session)
-        regions_list = await region_repo.get_all_names()
+    regions_list = await reference_data.get_regions()
         
     await message.answer("Выберите ваш регион:", reply_markup=get_region_keyboard(regions_list, edit_mode))
     await state.set_state(Registration.region)
 
 @router.message(Registration.region)
-async def reg_region(message: Message, state: FSMContext, user: dict | None):
+async def reg_region(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -300,20 +301,10 @@ async def reg_region(message: Message, state: FSMContext, user: dict | None):
         if not edit_mode:
             await state.update_data(interests=[])
         
-        async with get_session() as session:
-            interest_repo = InterestRepository(session)
-            interests_list = await interest_repo.get_all_names()
-        
-        await message.answer(
-            "Укажите ваши интересы (можно выбрать несколько):",
-            reply_markup=get_interests_keyboard(interests_list, data.get("interests", []), edit_mode)
-        )
-        await state.set_state(Registration.interests)
+        await show_interests_picker(message, state, data.get("interests", []) if edit_mode else [], edit_mode)
         return
     
-    async with get_session() as session:
-        region_repo = RegionRepository(session)
-        regions_list = await region_repo.get_all_names()
+    regions_list = await reference_data.get_regions()
     
     if edit_mode and region == "Оставить без изменений":
         region = data.get("region")
@@ -342,13 +333,13 @@ async def reg_region(message: Message, state: FSMContext, user: dict | None):
     if not edit_mode:
         await state.update_data(interests=[])
     
-    async with get_session() as session:
-        interest_repo = InterestRepository(session)
-        interests_list = await interest_repo.get_all_names()
-    
+    await show_interests_picker(message, state, data.get("interests", []) if edit_mode else [], edit_mode)
+
+
+async def show_interests_picker(message: Message, state: FSMContext, current: list, edit_mode: bool):
     await message.answer(
         "Укажите ваши интересы (можно выбрать несколько):",
-        reply_markup=get_interests_keyboard(interests_list, data.get("interests", []), edit_mode)
+        reply_markup=await start_interest_picker(state, current, edit_mode)
     )
     await state.set_state(Registration.interests)
 
@@ -390,11 +381,16 @@ async def reg_interests_skip(callback: types.CallbackQuery, state: FSMContext, u
     except TelegramBadRequest:
         pass
 
+@router.callback_query(Registration.interests, InterestCallback.filter())
+async def reg_interest_toggle(callback: types.CallbackQuery, callback_data: InterestCallback, state: FSMContext):
+    data = await state.get_data()
+    await handle_interest_callback(callback, callback_data, state, data.get("edit_mode", False))
+
+
 @router.callback_query(Registration.interests)
 async def reg_interests_callback(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
-    interests = data.get('interests', [])
 
     if callback.data == "keep_current":
         
@@ -425,6 +421,9 @@ async def reg_interests_callback(callback: types.CallbackQuery, state: FSMContex
         return
 
     if callback.data == "done":
+        interests = await get_picked_interests(callback, state, edit_mode)
+        if interests is None:
+            return
         if not interests:
             try:
                 await callback.answer("🚫 Укажите хотя бы один интерес.")
@@ -466,20 +465,6 @@ async def reg_interests_callback(callback: types.CallbackQuery, state: FSMContex
             pass  
         return
 
-    if callback.data in interests:
-        interests.remove(callback.data)
-    else:
-        interests.append(callback.data)
-
-    await state.update_data(interests=interests)
-    
-    async with get_session() as session:
-        interest_repo = InterestRepository(session)
-        interests_list = await interest_repo.get_all_names()
-        
-    await callback.message.edit_reply_markup(
-        reply_markup=get_interests_keyboard(interests_list, interests, edit_mode)
-    )
     try:
         await callback.answer()
     except TelegramBadRequest:
@@ -487,7 +472,7 @@ async def reg_interests_callback(callback: types.CallbackQuery, state: FSMContex
 
 
 @router.message(Registration.photo, F.text == "Оставить без изменений")
-async def reg_photo_keep(message: Message, state: FSMContext, user: dict | None):
+async def reg_photo_keep(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
     
@@ -506,7 +491,7 @@ async def reg_photo_keep(message: Message, state: FSMContext, user: dict | None)
 
 
 @router.message(Registration.photo, F.photo)
-async def reg_photo_media(message: Message, state: FSMContext, user: dict | None):
+async def reg_photo_media(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -535,7 +520,7 @@ async def reg_photo_media(message: Message, state: FSMContext, user: dict | None
 
 
 @router.message(Registration.photo, F.document)
-async def reg_photo_document(message: Message, state: FSMContext, user: dict | None):
+async def reg_photo_document(message: Message, state: FSMContext):
     doc = message.document
     bot = message.bot
 
@@ -594,7 +579,7 @@ async def reg_photo_document(message: Message, state: FSMContext, user: dict | N
 
 
 @router.message(Registration.photo, F.text == "Пропустить")
-async def reg_photo_skip(message: Message, state: FSMContext, user: dict | None):
+async def reg_photo_skip(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -622,7 +607,7 @@ async def reg_photo_skip(message: Message, state: FSMContext, user: dict | None)
 
 
 @router.message(Registration.photo)
-async def reg_photo_invalid(message: Message, state: FSMContext, user: dict | None):
+async def reg_photo_invalid(message: Message, state: FSMContext):
     await message.answer(
         "🚫 Отправьте фото (как изображение или файл JPG/PNG) "
         "или нажмите «Пропустить»"
@@ -641,7 +626,7 @@ async def ask_user_location(message: Message, edit_mode=False):
 
 
 @router.message(Registration.location, F.text == "Оставить без изменений")
-async def reg_location_keep(message: Message, state: FSMContext, user: dict | None):
+async def reg_location_keep(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
     
@@ -658,7 +643,7 @@ async def reg_location_keep(message: Message, state: FSMContext, user: dict | No
     await finish_registration(message, state, edit_mode, data["phone"])
 
 @router.message(Registration.location, F.location)
-async def reg_location_ok(message: Message, state: FSMContext, user: dict | None):
+async def reg_location_ok(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -682,7 +667,7 @@ async def reg_location_ok(message: Message, state: FSMContext, user: dict | None
 
 
 @router.message(Registration.location, F.text == "💻 Ручной ввод координат")
-async def reg_location_manual_start(message: Message, state: FSMContext, user: dict | None):
+async def reg_location_manual_start(message: Message, state: FSMContext):
     data = await state.get_data()
     edit_mode = data.get("edit_mode", False)
 
@@ -8,12 +8,12 @@ from states.states import Registration
 from keyboards.builders import (
     get_user_main_menu, get_admin_menu_keyboard, get_start_keyboard,
     get_resume_registration_keyboard, get_skip_edit_keyboard,
-    get_gender_keyboard, get_region_keyboard, get_interests_keyboard,
+    get_gender_keyboard, get_region_keyboard,
     get_photo_keyboard, get_location_keyboard, get_edit_profile_menu
 )
 
-from database import get_session
-from database.repositories import RegionRepository, InterestRepository
+from database.cache import reference_data
+from utils.interest_picker import start_interest_picker
 
 router = Router()
 
@@ -120,20 +120,11 @@ async def show_my_profile(message: Message, user: dict | None):
         text += f"❤️ Интересы: {safe_interests}\n"
 
     missing_fields = []
-    async with get_session() as session:
-        user_has_region = bool(region)  
-        if not user_has_region:
-            region_repo = RegionRepository(session)
-            regions_in_db = await region_repo.get_all_names()
-            if regions_in_db: 
-                missing_fields.append("регион")
-        
-        user_has_interests = bool(interests_clean) 
-        if not user_has_interests:
-            interest_repo = InterestRepository(session)
-            interests_in_db = await interest_repo.get_all_names()
-            if interests_in_db:  
-                missing_fields.append("интересы")
+    reference = await reference_data.get()
+    if not region and reference.regions:
+        missing_fields.append("регион")
+    if not interests_clean and reference.interests:
+        missing_fields.append("интересы")
     
     if missing_fields:
         text += f"\n⚠️ <b>Пожалуйста, заполните:</b> {', '.join(missing_fields)}\n"
@@ -200,7 +191,7 @@ async def back_to_profile_handler(callback: types.CallbackQuery, state: FSMConte
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_name")
-async def edit_field_name(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_name(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.name)
     data = await state.get_data()
@@ -212,7 +203,7 @@ async def edit_field_name(callback: types.CallbackQuery, state: FSMContext, user
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_surname")
-async def edit_field_surname(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_surname(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.surname)
     data = await state.get_data()
@@ -224,7 +215,7 @@ async def edit_field_surname(callback: types.CallbackQuery, state: FSMContext, u
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_gender")
-async def edit_field_gender(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_gender(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.gender)
     data = await state.get_data()
@@ -236,7 +227,7 @@ async def edit_field_gender(callback: types.CallbackQuery, state: FSMContext, us
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_age")
-async def edit_field_age(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_age(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.age)
     data = await state.get_data()
@@ -248,15 +239,13 @@ async def edit_field_age(callback: types.CallbackQuery, state: FSMContext, user:
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_region")
-async def edit_field_region(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_region(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.region)
     data = await state.get_data()
     current = data.get("region", "не указано")
     
-    async with get_session() as session:
-        region_repo = RegionRepository(session)
-        regions_list = await region_repo.get_all_names()
+    regions_list = await reference_data.get_regions()
 
     await callback.message.answer(
         f"Текущий регион: {current}\nВыберите регион:",
@@ -265,25 +254,21 @@ async def edit_field_region(callback: types.CallbackQuery, state: FSMContext, us
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_interests")
-async def edit_field_interests(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_interests(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.interests)
     data = await state.get_data()
     current_list = data.get("interests", [])
     current = ", ".join(current_list) if current_list else "не указаны"
     
-    async with get_session() as session:
-        interest_repo = InterestRepository(session)
-        interests_list = await interest_repo.get_all_names()
-    
     await callback.message.answer(
         f"Текущие интересы: {current}\nВыберите новые интересы:",
-        reply_markup=get_interests_keyboard(interests_list, current_list, edit_mode=True)
+        reply_markup=await start_interest_picker(state, current_list, edit_mode=True)
     )
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_photo")
-async def edit_field_photo(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_photo(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.photo)
     data = await state.get_data()
@@ -295,7 +280,7 @@ async def edit_field_photo(callback: types.CallbackQuery, state: FSMContext, use
     await callback.answer()
 
 @router.callback_query(F.data == "edit_field_location")
-async def edit_field_location(callback: types.CallbackQuery, state: FSMContext, user: dict | None):
+async def edit_field_location(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(single_edit=True)
     await state.set_state(Registration.location)
     data = await state.get_data()
@@ -308,7 +293,7 @@ async def edit_field_location(callback: types.CallbackQuery, state: FSMContext,
 
 
 @router.message(F.text == "❓ Помощь")
-async def show_help(message: Message, user: dict | None):
+async def show_help(message: Message):
     help_text = (
         "📖 <b>Инструкция по работе с ботом</b>\n\n"
         
@@ -1,5 +1,9 @@
+from collections import OrderedDict
+
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 
+from keyboards.callbacks import FriendPickCallback, InterestCallback
+
 def get_edit_profile_menu():
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="✏️ Имя", callback_data="edit_field_name"),
@@ -114,28 +118,92 @@ def get_region_keyboard(regions: list[str], edit_mode=False):
         one_time_keyboard=True
     )
 
-def get_interests_keyboard(all_interests: list[str], selected: list[str] = [], edit_mode=False) -> InlineKeyboardMarkup:
-    inline_kb = InlineKeyboardMarkup(inline_keyboard=[])
-    
-    if not all_interests:
-        inline_kb.inline_keyboard.append([
-            InlineKeyboardButton(text="⏭ Интересы еще не добавлены (пропустить)", callback_data="skip_interests")
-        ])
-    else:
-        for interest in all_interests:
-            text = f"✅ {interest}" if interest in selected else interest
-            callback_data = interest[:60] if len(interest.encode('utf-8')) <= 60 else interest[:20]
-            inline_kb.inline_keyboard.append([
-                InlineKeyboardButton(text=text, callback_data=callback_data)
-            ])
-        
-        buttons_row = [InlineKeyboardButton(text="Готово", callback_data="done")]
-        if edit_mode:
-            buttons_row.append(InlineKeyboardButton(text="Оставить без изменений", callback_data="keep_current"))
-        
-        inline_kb.inline_keyboard.append(buttons_row)
-    
-    return inline_kb
+INTERESTS_KEYBOARD_CACHE_SIZE = 64
+INTERESTS_PAGE_SIZE = 10
+
+
+class _InterestsKeyboardCache:
+
+    def __init__(self, maxsize: int, page_size: int = INTERESTS_PAGE_SIZE):
+        self.maxsize = maxsize
+        self.page_size = page_size
+        self._catalogue = None
+        self._token = None
+        self._rows = []
+        self._markups = OrderedDict()
+
+    def _build_rows(self, interests: dict[int, str], token: str):
+        self._catalogue = interests
+        self._token = token
+        self._rows = []
+        for index, interest in interests.items():
+            callback_data = InterestCallback(action="toggle", index=index, token=token).pack()
+            self._rows.append((
+                index,
+                [InlineKeyboardButton(text=interest, callback_data=callback_data)],
+                [InlineKeyboardButton(text=f"✅ {interest}", callback_data=callback_data)],
+            ))
+        self._markups.clear()
+
+    def pages(self) -> int:
+        return max(1, -(-len(self._rows) // self.page_size))
+
+    def _nav_row(self, page: int, pages: int) -> list:
+        def button(text: str, action: str, index: int = 0):
+            return InlineKeyboardButton(
+                text=text, callback_data=InterestCallback(action=action, index=index, token=self._token).pack()
+            )
+        return [
+            button("◀️", "page", (page - 1) % pages),
+            button(f"{page + 1}/{pages}", "noop"),
+            button("▶️", "page", (page + 1) % pages),
+        ]
+
+    def get(self, interests: dict[int, str], selected: int, edit_mode: bool,
+            page: int = 0, token: str = "") -> InlineKeyboardMarkup:
+        # The catalogue map comes from the reference-data snapshot and is replaced, never
+        # mutated, on reload, so its identity doubles as the catalogue version
+        if interests is not self._catalogue or token != self._token:
+            self._build_rows(interests, token)
+
+        pages = self.pages()
+        page = min(max(page, 0), pages - 1)
+        key = (selected, edit_mode, page)
+        markup = self._markups.get(key)
+        if markup is not None:
+            self._markups.move_to_end(key)
+            return markup
+
+        # One page at a time keeps the markup well under Telegram's ~100 button limit
+        rows = [
+            selected_row if selected >> index & 1 else plain_row
+            for index, plain_row, selected_row in self._rows[page * self.page_size:(page + 1) * self.page_size]
+        ]
+        if pages > 1:
+            rows.append(self._nav_row(page, pages))
+        rows.append(_EDIT_DONE_ROW if edit_mode else _DONE_ROW)
+        markup = InlineKeyboardMarkup(inline_keyboard=rows)
+
+        self._markups[key] = markup
+        if len(self._markups) > self.maxsize:
+            self._markups.popitem(last=False)
+        return markup
+
+
+_DONE_ROW = [InlineKeyboardButton(text="Готово", callback_data="done")]
+_EDIT_DONE_ROW = _DONE_ROW + [InlineKeyboardButton(text="Оставить без изменений", callback_data="keep_current")]
+_SKIP_INTERESTS_MARKUP = InlineKeyboardMarkup(inline_keyboard=[[
+    InlineKeyboardButton(text="⏭ Интересы еще не добавлены (пропустить)", callback_data="skip_interests")
+]])
+
+_interests_keyboard_cache = _InterestsKeyboardCache(INTERESTS_KEYBOARD_CACHE_SIZE)
+
+
+def get_interests_keyboard(interests: dict[int, str], selected: int = 0, edit_mode=False,
+                           page: int = 0, token: str = "") -> InlineKeyboardMarkup:
+    if not interests:
+        return _SKIP_INTERESTS_MARKUP
+    return _interests_keyboard_cache.get(interests, selected, edit_mode, page, token)
 
 def get_photo_keyboard(edit_mode=False):
     keyboard = [[KeyboardButton(text="Пропустить")]]
@@ -217,22 +285,49 @@ def get_location_keyboard(edit_mode=False):
     )
 
 
-def get_friends_select_keyboard(friends: list, selected: list = []) -> InlineKeyboardMarkup:
+FRIENDS_PAGE_SIZE = 8
+
+
+def filter_friends(friends: list, query: str = "") -> list[int]:
+    if not query:
+        return list(range(len(friends)))
+    return [index for index, (_, name) in enumerate(friends) if query in name.casefold()]
+
+
+def get_friends_select_keyboard(friends: list, selected: int = 0, page: int = 0, query: str = "") -> InlineKeyboardMarkup:
+    matches = filter_friends(friends, query)
+    pages = max(1, -(-len(matches) // FRIENDS_PAGE_SIZE))
+    page = min(max(page, 0), pages - 1)
+
     buttons = []
-    for friend in friends:
-        tg_id = friend.get('tg_id')
-        name = f"{friend.get('name', '')} {friend.get('surname', '')}".strip() or "Пользователь"
-        is_selected = tg_id in selected
-        text = f"✅ {name}" if is_selected else name
-        buttons.append([InlineKeyboardButton(text=text, callback_data=f"sel_friend_{tg_id}")])
-    
+    for index in matches[page * FRIENDS_PAGE_SIZE:(page + 1) * FRIENDS_PAGE_SIZE]:
+        name = friends[index][1]
+        text = f"✅ {name}" if selected >> index & 1 else name
+        buttons.append([InlineKeyboardButton(
+            text=text, callback_data=FriendPickCallback(action="toggle", value=index).pack()
+        )])
+
+    if pages > 1:
+        buttons.append([
+            InlineKeyboardButton(text="◀️", callback_data=FriendPickCallback(action="page", value=(page - 1) % pages).pack()),
+            InlineKeyboardButton(text=f"{page + 1}/{pages}", callback_data=FriendPickCallback(action="noop").pack()),
+            InlineKeyboardButton(text="▶️", callback_data=FriendPickCallback(action="page", value=(page + 1) % pages).pack()),
+        ])
+
+    if query:
+        buttons.append([InlineKeyboardButton(text=f"✖️ Сбросить поиск «{query}»", callback_data=FriendPickCallback(action="reset_search").pack())])
+    else:
+        buttons.append([InlineKeyboardButton(text="🔍 Поиск по имени", callback_data=FriendPickCallback(action="search").pack())])
+
     control_buttons = []
-    if friends:
-        control_buttons.append(InlineKeyboardButton(text="✅ Выбрать всех", callback_data="sel_all_friends"))
-    control_buttons.append(InlineKeyboardButton(text="📨 Отправить", callback_data="send_invites"))
+    if matches:
+        control_buttons.append(InlineKeyboardButton(text="✅ Выбрать всех", callback_data=FriendPickCallback(action="all").pack()))
+    selected_count = selected.bit_count()
+    send_text = f"📨 Отправить ({selected_count})" if selected_count else "📨 Отправить"
+    control_buttons.append(InlineKeyboardButton(text=send_text, callback_data=FriendPickCallback(action="send").pack()))
     buttons.append(control_buttons)
-    buttons.append([InlineKeyboardButton(text="❌ Отмена", callback_data="cancel_invites")])
-    
+    buttons.append([InlineKeyboardButton(text="❌ Отмена", callback_data=FriendPickCallback(action="cancel").pack())])
+
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
@@ -0,0 +1,12 @@
+from aiogram.filters.callback_data import CallbackData
+
+
+class InterestCallback(CallbackData, prefix="interest"):
+    action: str
+    index: int
+    token: str
+
+
+class FriendPickCallback(CallbackData, prefix="fpick"):
+    action: str
+    value: int = 0
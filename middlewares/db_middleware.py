@@ -0,0 +1,12 @@
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from database import session_scope
+
+
+class DatabaseMiddleware(BaseMiddleware):
+
+    async def __call__(self, handler, event: TelegramObject, data: dict):
+        async with session_scope() as session:
+            data["session"] = session
+            return await handler(event, data)
@@ -4,11 +4,19 @@ from aiogram.types import TelegramObject, Message, CallbackQuery
 
 from config import ADMIN_PHONES
 from database import get_session
+from database.cache import user_cache, MISSING
 from database.repositories import UserRepository
 
 
+def handler_needs_user(data: dict) -> bool:
+    handler_object = data.get("handler")
+    if handler_object is None:
+        return True
+    return handler_object.varkw or "user" in handler_object.params
+
+
 class UserMiddleware(BaseMiddleware):
-    
+
     async def __call__(self, handler, event: TelegramObject, data: dict):
         if isinstance(event, Message):
             user_id = event.from_user.id
@@ -17,23 +25,26 @@ class UserMiddleware(BaseMiddleware):
         else:
             return await handler(event, data)
 
-        try:
-            async with get_session() as session:
-                user_repo = UserRepository(session)
-                user = await user_repo.get_by_tg_id(user_id)
-                
-                if user:
-                    user_data = user.to_dict()
-                    
-                    if user_data["number"] in ADMIN_PHONES:
-                        user_data["role"] = "admin"
-                    
-                    data["user"] = user_data
-                else:
-                    data["user"] = None
-                    
-        except Exception as e:
-            logging.error(f"Middleware error for user {user_id}: {e}")
-            data["user"] = None
+        if not handler_needs_user(data):
+            return await handler(event, data)
+
+        user_data = user_cache.get_user(user_id)
+        if user_data is MISSING:
+            version = user_cache.version
+            try:
+                async with get_session() as session:
+                    user_repo = UserRepository(session)
+                    user = await user_repo.get_by_tg_id(user_id)
+                    user_data = user.to_dict() if user else None
+                user_cache.set_user(user_id, user_data, version)
+                if user_cache.misses % 1000 == 0:
+                    logging.info(f"User cache stats: {user_cache.stats()}")
+            except Exception as e:
+                logging.error(f"Middleware error for user {user_id}: {e}")
+                user_data = None
+
+        if user_data and user_data["number"] in ADMIN_PHONES:
+            user_data["role"] = "admin"
 
+        data["user"] = user_data
         return await handler(event, data)
@@ -7,7 +7,8 @@ load_dotenv()
 from database.db_config import engine, Base
 from database.models import (
     User, Event, EventParticipant, EventInvite,
-    Friend, FriendRequest, Interest, Region
+    Friend, FriendRequest, Interest, Region,
+    UserInterest, EventInterest
 )
 
 
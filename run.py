@@ -1,42 +1,62 @@
 import asyncio
 import logging
+import os
 import sys
 from contextlib import asynccontextmanager
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
 
 from config import BOT_TOKEN
-from database import engine, Base, get_session
-from database.repositories import RegionRepository, InterestRepository
+from database import engine, replica_engine, Base, pool_stats
+from database.cache import user_cache, reference_data
+from database.migrations import run_migrations
+from middlewares.db_middleware import DatabaseMiddleware
 from middlewares.user_middleware import UserMiddleware
+from states.storage import PostgresStorage, create_storage, FSM_CLEANUP_INTERVAL
 from handlers import user, admin, registration, events, communication
 
 
 async def init_database():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(conn)
     logging.info("Database tables initialized")
 
 
 async def check_reference_data():
-    async with get_session() as session:
-        region_repo = RegionRepository(session)
-        interest_repo = InterestRepository(session)
-        
-        regions = await region_repo.get_all_names()
-        interests = await interest_repo.get_all_names()
-        
-        if not regions:
-            print("ВНИМАНИЕ: таблица regions пуста! Загрузите Excel-файл через админ-панель.")
-        if not interests:
-            print("ВНИМАНИЕ: таблица interests пуста! Загрузите Excel-файл через админ-панель.")
+    reference = await reference_data.get()
+    
+    if not reference.regions:
+        print("ВНИМАНИЕ: таблица regions пуста! Загрузите Excel-файл через админ-панель.")
+    if not reference.interests:
+        print("ВНИМАНИЕ: таблица interests пуста! Загрузите Excel-файл через админ-панель.")
+
+
+async def log_pool_stats(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        logging.info(f"DB pool stats: {pool_stats()}")
+
+
+async def purge_fsm_states(storage: PostgresStorage, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            purged = await storage.purge_expired()
+            if purged:
+                logging.info(f"Purged expired FSM states: {purged}")
+        except Exception as e:
+            logging.error(f"Failed to purge expired FSM states: {e}")
 
 
 async def close_database():
+    logging.info(f"User cache stats: {user_cache.stats()}")
+    logging.info(f"DB pool stats: {pool_stats()}")
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logging.info("Database connections closed")
 
 
@@ -49,9 +69,10 @@ async def main():
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
     
-    storage = MemoryStorage()
+    storage = create_storage()
     dp = Dispatcher(storage=storage)
 
+    dp.update.outer_middleware(DatabaseMiddleware())
     dp.message.middleware(UserMiddleware())
     dp.callback_query.middleware(UserMiddleware())
 
@@ -68,10 +89,24 @@ async def main():
     )
 
     print("Бот запускается...")
+
+    stats_task = None
+    stats_interval = float(os.getenv("DB_POOL_STATS_INTERVAL", "0"))
+    if stats_interval > 0:
+        stats_task = asyncio.create_task(log_pool_stats(stats_interval))
+
+    purge_task = None
+    if isinstance(storage, PostgresStorage) and FSM_CLEANUP_INTERVAL > 0:
+        purge_task = asyncio.create_task(purge_fsm_states(storage, FSM_CLEANUP_INTERVAL))
     
     try:
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types(), skip_updates=True)
     finally:
+        if stats_task:
+            stats_task.cancel()
+        if purge_task:
+            purge_task.cancel()
+        await storage.close()
         await close_database()
 
 if __name__ == "__main__":
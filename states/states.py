@@ -25,9 +25,15 @@ class CreateEvent(StatesGroup):
     photo = State()
     invite_friends = State()
     select_friends = State()
+    search_friends = State()
     confirm = State()
     confirm_address = State()
 
 
+class InviteFriends(StatesGroup):
+    select = State()
+    search = State()
+
+
 class MessageState(StatesGroup):
     waiting_message = State()
@@ -0,0 +1,212 @@
+import json
+import os
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import case, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.db_config import create_fsm_engine
+from database.models import FsmState
+
+FSM_STORAGE = os.getenv("FSM_STORAGE", "memory").lower()
+FSM_REDIS_URL = os.getenv("FSM_REDIS_URL", "redis://localhost:6379/0")
+FSM_STATE_TTL = int(os.getenv("FSM_STATE_TTL", "86400"))
+FSM_CLEANUP_INTERVAL = float(os.getenv("FSM_CLEANUP_INTERVAL", "3600"))
+
+
+def _state_name(state: StateType) -> Optional[str]:
+    return state.state if isinstance(state, State) else state
+
+
+class RedisStorage(BaseStorage):
+
+    def __init__(self, redis, ttl: int = FSM_STATE_TTL, key_builder: Optional[KeyBuilder] = None):
+        # Any client speaking the redis.asyncio API with decode_responses=True works here,
+        # including in-process stand-ins such as fakeredis
+        self.redis = redis
+        self.ttl = ttl
+        self.key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+
+    @classmethod
+    def from_url(cls, url: str, ttl: int = FSM_STATE_TTL) -> "RedisStorage":
+        from redis.asyncio import Redis
+        return cls(Redis.from_url(url, decode_responses=True), ttl)
+
+    def _keys(self, key: StorageKey):
+        return self.key_builder.build(key, "state"), self.key_builder.build(key, "data")
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state_key, data_key = self._keys(key)
+        state = _state_name(state)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if state is None:
+                pipe.delete(state_key)
+            else:
+                pipe.set(state_key, state, ex=self.ttl)
+            pipe.expire(data_key, self.ttl)
+            await pipe.execute()
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state_key, _ = self._keys(key)
+        return await self.redis.get(state_key)
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        state_key, data_key = self._keys(key)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(data_key)
+            if data:
+                pipe.hset(data_key, mapping=self._encode(data))
+                pipe.expire(data_key, self.ttl)
+            pipe.expire(state_key, self.ttl)
+            await pipe.execute()
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data_key = self._keys(key)
+        return self._decode(await self.redis.hgetall(data_key))
+
+    async def get_value(self, storage_key: StorageKey, dict_key: str, default: Optional[Any] = None) -> Optional[Any]:
+        _, data_key = self._keys(storage_key)
+        value = await self.redis.hget(data_key, dict_key)
+        return default if value is None else json.loads(value)
+
+    async def update_data(self, key: StorageKey, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not data:
+            return await self.get_data(key)
+
+        state_key, data_key = self._keys(key)
+
+        # Data lives in a hash, one field per key, so a partial update is a single
+        # round trip with no read-modify-write race between replicas
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(data_key, mapping=self._encode(data))
+            pipe.expire(data_key, self.ttl)
+            pipe.expire(state_key, self.ttl)
+            pipe.hgetall(data_key)
+            results = await pipe.execute()
+        return self._decode(results[-1])
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    @staticmethod
+    def _encode(data: Dict[str, Any]) -> Dict[str, str]:
+        return {name: json.dumps(value, ensure_ascii=False) for name, value in data.items()}
+
+    @staticmethod
+    def _decode(fields: Dict[str, str]) -> Dict[str, Any]:
+        return {name: json.loads(value) for name, value in fields.items()}
+
+
+class PostgresStorage(BaseStorage):
+
+    def __init__(self, engine: AsyncEngine, ttl: int = FSM_STATE_TTL, key_builder: Optional[KeyBuilder] = None):
+        # Runs on its own engine rather than the per-update session, so FSM writes survive
+        # a handler rollback and never wait on the pool the update is already holding
+        self.engine = engine
+        self.ttl = ttl
+        self.key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+
+    def _upsert(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]):
+        return insert(FsmState).values(
+            key=self.key_builder.build(key),
+            state=state,
+            data=data,
+            expires_at=func.now() + timedelta(seconds=self.ttl)
+        )
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        stmt = self._upsert(key, _state_name(state), {})
+        alive = FsmState.expires_at > func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FsmState.key],
+            set_={
+                "state": stmt.excluded.state,
+                "data": case((alive, FsmState.data), else_=stmt.excluded.data),
+                "expires_at": stmt.excluded.expires_at,
+            }
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(stmt)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(FsmState.state).where(
+                    FsmState.key == self.key_builder.build(key),
+                    FsmState.expires_at > func.now()
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        stmt = self._upsert(key, None, data)
+        alive = FsmState.expires_at > func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FsmState.key],
+            set_={
+                "state": case((alive, FsmState.state), else_=None),
+                "data": stmt.excluded.data,
+                "expires_at": stmt.excluded.expires_at,
+            }
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(stmt)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(FsmState.data).where(
+                    FsmState.key == self.key_builder.build(key),
+                    FsmState.expires_at > func.now()
+                )
+            )
+            return result.scalar_one_or_none() or {}
+
+    async def update_data(self, key: StorageKey, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Merge server-side with jsonb || so the read and the write share one round trip
+        stmt = self._upsert(key, None, data)
+        alive = FsmState.expires_at > func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FsmState.key],
+            set_={
+                "state": case((alive, FsmState.state), else_=None),
+                "data": case(
+                    (alive, FsmState.data.op("||", return_type=JSONB)(stmt.excluded.data)),
+                    else_=stmt.excluded.data
+                ),
+                "expires_at": stmt.excluded.expires_at,
+            }
+        ).returning(FsmState.data)
+        async with self.engine.begin() as conn:
+            result = await conn.execute(stmt)
+            return result.scalar_one()
+
+    async def purge_expired(self) -> int:
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                delete(FsmState).where(or_(
+                    FsmState.expires_at <= func.now(),
+                    (FsmState.state.is_(None)) & (FsmState.data == {})
+                ))
+            )
+            return result.rowcount
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+
+def create_storage() -> BaseStorage:
+    if FSM_STORAGE == "memory":
+        return MemoryStorage()
+    if FSM_STORAGE == "redis":
+        return RedisStorage.from_url(FSM_REDIS_URL)
+    if FSM_STORAGE == "postgres":
+        return PostgresStorage(create_fsm_engine())
+    raise ValueError(f"Unknown FSM_STORAGE={FSM_STORAGE!r}, expected memory, redis or postgres")
@@ -0,0 +1,31 @@
+from typing import Dict, Iterable, Iterator, List
+
+
+def toggle(mask: int, id: int) -> int:
+    return mask ^ (1 << id)
+
+
+def contains(mask: int, id: int) -> bool:
+    return bool(mask >> id & 1)
+
+
+def from_ids(ids: Iterable[int]) -> int:
+    mask = 0
+    for id in ids:
+        mask |= 1 << id
+    return mask
+
+
+def iter_ids(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def from_names(names: Iterable[str], ids_by_name: Dict[str, int]) -> int:
+    return from_ids(ids_by_name[name] for name in names if name in ids_by_name)
+
+
+def to_names(mask: int, names_by_id: Dict[int, str]) -> List[str]:
+    return [names_by_id[id] for id in iter_ids(mask) if id in names_by_id]
@@ -1,72 +1,150 @@
 import asyncio
-from openpyxl import Workbook
+import io
+import queue
+import time
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from openpyxl import Workbook, load_workbook
 from database import get_session
 from database.repositories import UserRepository, EventRepository
 from database.models import User, Event, EventParticipant, Interest, Region
 
-async def export_users_report(filepath: str):
-    async with get_session() as session:
+REPORT_CHUNK_SIZE = 1000
+REPORT_QUEUE_SIZE = 4
+REPORT_PROGRESS_INTERVAL = 5.0
+
+IMPORT_MAX_FILE_SIZE = 5 * 1024 * 1024
+IMPORT_MAX_ROWS = 10000
+
+INTEREST_SHEET_NAMES = ["Interests", "Интересы", "interests", "интересы"]
+REGION_SHEET_NAMES = ["Regions", "Регионы", "regions", "регионы"]
+
+ProgressCallback = Callable[[int, Optional[int]], Awaitable[None]]
+
+
+def _write_workbook(title: str, headers: List[str], chunks: queue.Queue, output: io.BytesIO):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append(headers)
+
+    # Keep draining after a failure so the producer never blocks on a full queue
+    failure = None
+    while (rows := chunks.get()) is not None:
+        if failure is not None:
+            continue
+        try:
+            for row in rows:
+                ws.append(row)
+        except Exception as e:
+            failure = e
+
+    if failure is not None:
+        raise failure
+    wb.save(output)
+
+
+async def _stream_to_workbook(
+    title: str,
+    headers: List[str],
+    row_chunks: AsyncIterator[List[Tuple]],
+    total: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None
+) -> bytes:
+    output = io.BytesIO()
+    chunks = queue.Queue(maxsize=REPORT_QUEUE_SIZE)
+    writer = asyncio.ensure_future(
+        asyncio.to_thread(_write_workbook, title, headers, chunks, output)
+    )
+
+    written = 0
+    last_progress = time.monotonic()
+    try:
+        async for rows in row_chunks:
+            await asyncio.to_thread(chunks.put, rows)
+            written += len(rows)
+
+            if progress and time.monotonic() - last_progress >= REPORT_PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                await progress(written, total)
+    finally:
+        await asyncio.to_thread(chunks.put, None)
+        await writer
+
+    return output.getvalue()
+
+
+async def export_users_report(progress: Optional[ProgressCallback] = None) -> bytes:
+    headers = ["Phone", "Role", "Name", "Surname", "Gender", "Age", "Region", "Interests", "Photo ID"]
+
+    async with get_session(readonly=True) as session:
         user_repo = UserRepository(session)
-        users = await user_repo.get_all()
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Пользователи"
-
-        headers = ["Phone", "Role", "Name", "Surname", "Gender", "Age", "Region", "Interests", "Photo ID"]
-        ws.append(headers)
-
-        for user in users:
-            row = [
-                user.number,
-                user.role,
-                user.name,
-                user.surname,
-                user.gender,
-                user.age,
-                user.region,
-                user.interests,
-                user.photo_file_id
-            ]
-            ws.append(row)
-
-        await asyncio.to_thread(wb.save, filepath)
-
-
-async def export_events_report(filepath: str):
-
-    from database.repositories import ParticipantRepository
-    
-    async with get_session() as session:
+        total = await user_repo.count()
+        return await _stream_to_workbook(
+            "Пользователи", headers,
+            user_repo.stream_report_rows(REPORT_CHUNK_SIZE),
+            total, progress
+        )
+
+
+async def export_events_report(progress: Optional[ProgressCallback] = None) -> bytes:
+    headers = [
+        "ID", "Name", "Date", "Time", "Interests", "Address",
+        "Description", "Organizer Phone", "Participants Count"
+    ]
+
+    async with get_session(readonly=True) as session:
         event_repo = EventRepository(session)
-        part_repo = ParticipantRepository(session)
-        events = await event_repo.get_all()
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Мероприятия"
-
-        headers = [
-            "ID", "Name", "Date", "Time", "Interests", "Address", 
-            "Description", "Organizer Phone", "Participants Count"
-        ]
-        ws.append(headers)
-
-        for event in events:
-            participants = await part_repo.get_participants(event.id)
-            participant_count = len(participants) if participants else 0
-            
-            row = [
-                event.id,
-                event.name,
-                event.date,
-                event.time,
-                event.interests,
-                event.address,
-                event.description,
-                event.organizer_phone,
-                participant_count
-            ]
-            ws.append(row)
-
-        await asyncio.to_thread(wb.save, filepath)
+        return await _stream_to_workbook(
+            "Мероприятия", headers,
+            event_repo.stream_report_rows(REPORT_CHUNK_SIZE),
+            progress=progress
+        )
+
+
+class ImportLimitError(ValueError):
+    pass
+
+
+def _data_rows(ws):
+    # Reject instead of truncating: replace_all treats missing names as deleted
+    for index, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=1):
+        if index > IMPORT_MAX_ROWS:
+            if row and any(value is not None and str(value).strip() for value in row):
+                raise ImportLimitError(
+                    f"Лист «{ws.title}» содержит больше {IMPORT_MAX_ROWS} строк"
+                )
+            continue
+        yield row
+
+
+def _first_column(ws) -> List[str]:
+    values = []
+    for row in _data_rows(ws):
+        if row and row[0]:
+            values.append(str(row[0]).strip())
+    return values
+
+
+def parse_lists_workbook(source) -> Tuple[List[str], List[str]]:
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        interests = []
+        regions = []
+
+        interest_ws = next((wb[name] for name in INTEREST_SHEET_NAMES if name in wb.sheetnames), None)
+        region_ws = next((wb[name] for name in REGION_SHEET_NAMES if name in wb.sheetnames), None)
+
+        if interest_ws is None and len(wb.sheetnames) == 1:
+            for row in _data_rows(wb.active):
+                if row and len(row) >= 1 and row[0]:
+                    interests.append(str(row[0]).strip())
+                if row and len(row) >= 2 and row[1]:
+                    regions.append(str(row[1]).strip())
+        else:
+            if interest_ws is not None:
+                interests = _first_column(interest_ws)
+            if region_ws is not None:
+                regions = _first_column(region_ws)
+
+        return interests, regions
+    finally:
+        wb.close()
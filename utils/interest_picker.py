@@ -0,0 +1,89 @@
+from typing import Iterable, List, Optional
+
+from aiogram import types
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+
+from database.cache import reference_data
+from keyboards.builders import get_interests_keyboard
+from keyboards.callbacks import InterestCallback
+from utils import bitset
+
+STALE_CATALOGUE_TEXT = "Список интересов обновился, выберите интересы заново."
+
+
+async def _safe_answer(callback: types.CallbackQuery, text: Optional[str] = None, show_alert: bool = False):
+    try:
+        await callback.answer(text, show_alert=show_alert)
+    except TelegramBadRequest:
+        pass
+
+
+async def _edit_picker(callback: types.CallbackQuery, reference, mask: int, page: int, edit_mode: bool):
+    try:
+        await callback.message.edit_reply_markup(
+            reply_markup=get_interests_keyboard(
+                reference.interest_names, mask, edit_mode, page, reference.interest_token
+            )
+        )
+    except TelegramBadRequest:
+        pass
+
+
+async def start_interest_picker(state: FSMContext, current: Iterable[str] = (), edit_mode: bool = False):
+    reference = await reference_data.get()
+    mask = bitset.from_names(current, reference.interest_indexes)
+    await state.update_data(
+        interests_mask=mask,
+        interests_token=reference.interest_token,
+        interests_page=0
+    )
+    return get_interests_keyboard(reference.interest_names, mask, edit_mode, 0, reference.interest_token)
+
+
+async def _reset_stale_picker(callback: types.CallbackQuery, state: FSMContext, reference, edit_mode: bool):
+    # Bits are catalogue positions, so a selection made against another catalogue can
+    # point at different interests; start over rather than guess
+    await state.update_data(interests_mask=0, interests_token=reference.interest_token, interests_page=0)
+    await _edit_picker(callback, reference, 0, 0, edit_mode)
+    await _safe_answer(callback, STALE_CATALOGUE_TEXT, show_alert=True)
+
+
+async def handle_interest_callback(
+    callback: types.CallbackQuery, callback_data: InterestCallback,
+    state: FSMContext, edit_mode: bool = False
+):
+    if callback_data.action == "noop":
+        await _safe_answer(callback)
+        return
+
+    data = await state.get_data()
+    reference = await reference_data.get()
+    token = reference.interest_token
+    if callback_data.token != token or data.get("interests_token") != token:
+        await _reset_stale_picker(callback, state, reference, edit_mode)
+        return
+
+    mask = data.get("interests_mask", 0)
+    page = data.get("interests_page", 0)
+    if callback_data.action == "toggle" and callback_data.index in reference.interest_names:
+        mask = bitset.toggle(mask, callback_data.index)
+        await state.update_data(interests_mask=mask)
+    elif callback_data.action == "page":
+        page = callback_data.index
+        await state.update_data(interests_page=page)
+
+    await _edit_picker(callback, reference, mask, page, edit_mode)
+    await _safe_answer(callback)
+
+
+async def get_picked_interests(
+    callback: types.CallbackQuery, state: FSMContext, edit_mode: bool = False
+) -> Optional[List[str]]:
+    data = await state.get_data()
+    reference = await reference_data.get()
+    mask = data.get("interests_mask", 0)
+    if mask and data.get("interests_token") != reference.interest_token:
+        await _reset_stale_picker(callback, state, reference, edit_mode)
+        return None
+    return bitset.to_names(mask, reference.interest_names)